@@ -0,0 +1,276 @@
+""" Benchmark cases for the engine's hot paths.
+SDL must be initialized before this module is imported.
+"""
+from __future__ import annotations
+
+import math
+import random
+from typing import Callable, Optional
+
+import sdl2
+import sdl2.ext
+
+from benchmarks.harness import SCALES, benchmark
+from core.actor import Actor
+from core.datatypes.point import Point
+from core.datatypes.vector2 import Vector2
+from core.engine import Engine
+from core.entity import Entity
+from core.scene import Scene
+from core.sprite import Sprite
+from core.text import Text
+from pong import constants
+from pong.entities.ball import Ball
+from pong.game import create_window
+from pong.scenes.game_scene import GameScene
+
+
+# Size of each actor in the stress scenes, and the area that each actor gets on average
+BOX_SIZE = 4
+AREA_PER_ACTOR = 24 * 24
+
+_engine: Optional[Engine] = None
+
+
+def engine() -> Engine:
+    """ Get the engine that the cases run in. It draws with the software renderer to a hidden window. """
+    global _engine
+    if _engine is None:
+        window = create_window("Benchmarks", constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+        renderer = sdl2.ext.Renderer(
+            window,
+            logical_size=(constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT),
+            flags=sdl2.SDL_RENDERER_SOFTWARE
+        )
+        _engine = Engine(window, renderer)
+    return _engine
+
+
+def load_scene(scene: Scene) -> Scene:
+    """ Make a scene the engine's current scene, and start it. """
+    current_engine = engine()
+    current_engine.scene = scene
+    current_engine.transition_scene()
+    return scene
+
+
+class Box(Actor):
+    """ An actor that moves in a straight line, and bounces off other boxes and the edges of the world. """
+    def __init__(self, world_size: int, velocity: Vector2) -> None:
+        super().__init__()
+        self.width = BOX_SIZE
+        self.height = BOX_SIZE
+        self.world_size = world_size
+        self.velocity = velocity
+
+    def update(self) -> None:
+        # Bounce off the edges of the world
+        velocity = self.velocity
+        if (self.x <= 0 and velocity.x < 0) or (self.x + BOX_SIZE >= self.world_size and velocity.x > 0):
+            velocity.x *= -1
+        if (self.y <= 0 and velocity.y < 0) or (self.y + BOX_SIZE >= self.world_size and velocity.y > 0):
+            velocity.y *= -1
+
+        self.move_x(self.velocity.x, self.on_collide_x)
+        self.move_y(self.velocity.y, self.on_collide_y)
+
+    def on_collide_x(self, entity: Entity) -> None:
+        self.velocity.x *= -1
+
+    def on_collide_y(self, entity: Entity) -> None:
+        self.velocity.y *= -1
+
+
+class StressScene(Scene):
+    """ A scene with many boxes spread over a square world, at the same density at every size. """
+    def __init__(self, size: int, rng: random.Random, swept_movement: bool = False) -> None:
+        super().__init__()
+        self.size = size
+        self.rng = rng
+        self.swept_movement = swept_movement
+        self.world_size = int(math.sqrt(size * AREA_PER_ACTOR))
+
+    def load_entities(self) -> None:
+        rng = self.rng
+        for _ in range(self.size):
+            velocity = Vector2(rng.uniform(-2, 2), rng.uniform(-2, 2))
+            box = Box(self.world_size, velocity)
+            box.x = rng.randrange(0, self.world_size - BOX_SIZE)
+            box.y = rng.randrange(0, self.world_size - BOX_SIZE)
+            box.swept_movement = self.swept_movement
+            self.entities.add(box)
+
+
+def steps(scene: Scene, count: int) -> Callable[[], int]:
+    """ Update a scene a number of times. Each update of each actor counts as one operation. """
+    def run() -> int:
+        for _ in range(count):
+            scene.update()
+            scene.after_update()
+        return count * scene.size
+    return run
+
+
+@benchmark("actor_move", SCALES)
+def actor_move(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Actors moving one pixel at a time with move_x / move_y. """
+    scene = load_scene(StressScene(size, rng))
+    return steps(scene, max(1, 2000 // size))
+
+
+@benchmark("actor_move_swept", SCALES)
+def actor_move_swept(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Actors moving with swept collision checks. """
+    scene = load_scene(StressScene(size, rng, swept_movement=True))
+    return steps(scene, max(1, 2000 // size))
+
+
+@benchmark("entity_churn", SCALES)
+def entity_churn(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Removing a tenth of the entities from a list and adding them back. Each add or remove is an operation. """
+    scene = load_scene(StressScene(size, rng))
+    entities = scene.entities
+    boxes = list(entities)
+    churn = max(1, size // 10)
+
+    def run() -> int:
+        for _ in range(10):
+            chosen = rng.sample(boxes, churn)
+            for box in chosen:
+                entities.remove(box)
+            entities.update_list()
+            for box in chosen:
+                entities.add(box)
+            entities.update_list()
+        return 10 * churn * 2
+    return run
+
+
+@benchmark("entity_find", SCALES)
+def entity_find(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Looking up entities by name with Entity.find. """
+    scene = load_scene(StressScene(size, rng))
+    for index, box in enumerate(scene.entities):
+        box.name = f"Box {index}"
+    names = [f"Box {rng.randrange(size)}" for _ in range(5000)]
+
+    def run() -> int:
+        for name in names:
+            Entity.find(name)
+        return len(names)
+    return run
+
+
+@benchmark("calculate_score_position")
+def calculate_score_position(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Predicting where the ball crosses the goal line, from random positions and angles. """
+    scene = load_scene(GameScene())
+    ball = scene.entities.of_type(Ball).first()
+
+    launches = list()
+    for _ in range(200):
+        position = (
+            rng.randrange(40, constants.SCREEN_WIDTH - 40),
+            rng.randrange(10, constants.SCREEN_HEIGHT - 10)
+        )
+        direction = Vector2.left() if rng.random() < .5 else Vector2.right()
+        direction.rotate(rng.choice(range(-60, 61, 15)))
+        launches.append((position, direction))
+
+    def run() -> int:
+        for (x, y), direction in launches:
+            ball.x = x
+            ball.y = y
+            ball.direction = direction.copy()
+            ball.calculate_score_position()
+        return len(launches)
+    return run
+
+
+def draw(drawables: list, positions: list[Point]) -> Callable[[], int]:
+    """ Draw sprites or text at fixed positions, and flush them to the renderer. """
+    current_engine = engine()
+    renderer = current_engine.renderer
+    batch = current_engine.sprite_batch
+
+    def run() -> int:
+        for _ in range(10):
+            renderer.clear((0, 0, 0))
+            for drawable, position in zip(drawables, positions):
+                drawable.draw(position)
+            batch.flush()
+        return 10 * len(drawables)
+    return run
+
+
+def random_positions(size: int, rng: random.Random) -> list[Point]:
+    return [
+        Point(rng.randrange(constants.SCREEN_WIDTH), rng.randrange(constants.SCREEN_HEIGHT))
+        for _ in range(size)
+    ]
+
+
+@benchmark("sprite_draw", SCALES)
+def sprite_draw(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Drawing sprites through the sprite batch. """
+    load_scene(StressScene(0, rng))
+    sprites = [Sprite(rng.choice(("ball.png", "player_green.png", "player_red.png"))) for _ in range(size)]
+    return draw(sprites, random_positions(size, rng))
+
+
+@benchmark("text_draw", SCALES)
+def text_draw(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Drawing short strings from the glyph atlas. """
+    load_scene(StressScene(0, rng))
+    color = sdl2.SDL_Color(255, 253, 242)
+    texts = list()
+    for _ in range(size):
+        text = Text("m5x7.ttf", 32, color)
+        text.text = rng.randrange(100)
+        texts.append(text)
+    return draw(texts, random_positions(size, rng))
+
+
+@benchmark("game_scene_step")
+def game_scene_step(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Fixed steps of the game scene, without drawing. Each step is an operation. """
+    current_engine = engine()
+    current_engine.reseed(rng.randrange(2 ** 32))
+    load_scene(GameScene())
+
+    def run() -> int:
+        for _ in range(600):
+            current_engine.step()
+        return 600
+    return run
+
+
+@benchmark("scene_snapshot")
+def scene_snapshot(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Saving the game scene's state and restoring it, once per step. Each save and restore is an operation. """
+    current_engine = engine()
+    current_engine.reseed(rng.randrange(2 ** 32))
+    scene = load_scene(GameScene())
+
+    def run() -> int:
+        for _ in range(600):
+            snapshot = scene.save_state()
+            current_engine.step()
+            scene.load_state(snapshot)
+        return 600
+    return run
+
+
+@benchmark("game_scene_frame")
+def game_scene_frame(size: int, rng: random.Random) -> Callable[[], int]:
+    """ Fixed steps of the game scene, each followed by a draw. Each frame is an operation. """
+    current_engine = engine()
+    current_engine.reseed(rng.randrange(2 ** 32))
+    load_scene(GameScene())
+
+    def run() -> int:
+        for _ in range(300):
+            current_engine.step()
+            current_engine.draw()
+        return 300
+    return run
@@ -0,0 +1,160 @@
+""" Runs benchmark cases, and saves and compares their results. """
+from __future__ import annotations
+
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+
+# Actor counts that scaled cases are run at
+SCALES = (10, 100, 1000, 10000)
+
+# A case is set up with a size and a random generator, and returns a function that does the work being measured.
+# That function returns the number of operations that it did.
+CaseFactory = Callable[[int, random.Random], Callable[[], int]]
+
+
+class Case(NamedTuple):
+    name: str
+    factory: CaseFactory
+    sizes: tuple[int, ...]
+
+
+class Result(NamedTuple):
+    name: str
+    size: int
+    ops: int
+    best: float
+    median: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]"
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.ops / self.best if self.best > 0 else 0.0
+
+
+_cases: list[Case] = list()
+
+
+def benchmark(name: str, sizes: tuple[int, ...] = (1, )) -> Callable[[CaseFactory], CaseFactory]:
+    """ Register a benchmark case. The case is run once for each size. """
+    def register(factory: CaseFactory) -> CaseFactory:
+        _cases.append(Case(name, factory, sizes))
+        return factory
+    return register
+
+
+def cases() -> list[Case]:
+    """ Get every registered case, in the order they were registered. """
+    return list(_cases)
+
+
+def run_case(case: Case, size: int, seed: int, repeat: int) -> Result:
+    """ Set up a case, run it once to warm up, then time it 'repeat' times. """
+    # The game draws from the engine's generator, so it is seeded along with the case's generator.
+    # An engine that a case creates picks its seed from the global generator, so that is seeded too.
+    # The engine is imported here, because SDL is only initialized after this module is imported.
+    from core.engine import Engine
+    engine = Engine.instance()
+    if engine:
+        engine.reseed(seed)
+    random.seed(seed)
+    rng = random.Random(f"{seed}:{case.name}:{size}")
+    run = case.factory(size, rng)
+    run()
+
+    timings = list()
+    ops = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ops = run()
+        timings.append(time.perf_counter() - start)
+
+    return Result(case.name, size, ops, min(timings), statistics.median(timings))
+
+
+def run_all(
+        seed: int = 1234,
+        repeat: int = 5,
+        name_filter: Optional[str] = None,
+        max_size: Optional[int] = None
+) -> list[Result]:
+    """ Run every case that matches the filter, and print each result as it finishes. """
+    results = list()
+    for case in _cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        for size in case.sizes:
+            if max_size is not None and size > max_size:
+                continue
+            result = run_case(case, size, seed, repeat)
+            print(f"{result.key:<32}{result.ops_per_second:>16,.0f} ops/s{result.best * 1000:>12.3f} ms")
+            results.append(result)
+    return results
+
+
+def save_results(results: list[Result], output_file: Path, seed: int, repeat: int) -> None:
+    """ Write results as JSON. """
+    data = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": {
+            result.key: {
+                "name": result.name,
+                "size": result.size,
+                "ops": result.ops,
+                "best": result.best,
+                "median": result.median,
+                "ops_per_second": result.ops_per_second,
+            }
+            for result in results
+        }
+    }
+    output_file.write_text(json.dumps(data, indent=2) + "\n")
+
+
+def compare(results: list[Result], baseline_file: Path, threshold: float) -> int:
+    """ Compare results to a baseline, and print the change for each case.
+    Returns the number of cases that are slower than the baseline by more than the threshold.
+    """
+    baseline = json.loads(baseline_file.read_text())["results"]
+
+    regressions = 0
+    print()
+    print(f"{'case':<32}{'baseline':>12}{'current':>12}{'change':>10}")
+    for result in results:
+        previous = baseline.get(result.key)
+        if previous is None:
+            print(f"{result.key:<32}{'-':>12}{result.best * 1000:>10.3f}ms{'new':>10}")
+            continue
+
+        # Compare the time per operation, in case the amount of work per run has changed
+        previous_time = previous["best"] / max(previous["ops"], 1)
+        current_time = result.best / max(result.ops, 1)
+        change = current_time / previous_time - 1 if previous_time > 0 else 0.0
+
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{result.key:<32}{previous['best'] * 1000:>10.3f}ms{result.best * 1000:>10.3f}ms"
+            f"{change * 100:>+9.1f}%{flag}"
+        )
+
+    print(f"\n{regressions} regression(s) over {threshold * 100:.0f}%", file=sys.stderr if regressions else sys.stdout)
+    return regressions
@@ -0,0 +1,59 @@
+""" Run the benchmark suite.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline baseline.json
+
+Everything runs headless, on SDL's dummy video and audio drivers with the software renderer, so results only
+depend on the CPU. Every case is seeded, so each run does exactly the same work.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+
+def main() -> int:
+    args = parse_args()
+
+    # The dummy drivers must be chosen before SDL is initialized
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    from core.utilities.sdl_init import initialize_sdl
+    initialize_sdl()
+
+    # Cases are registered when they are imported
+    import benchmarks.cases
+    from benchmarks import harness
+
+    results = harness.run_all(args.seed, args.repeat, args.filter, args.max_size)
+
+    if args.output:
+        harness.save_results(results, args.output, args.seed, args.repeat)
+    if args.baseline:
+        regressions = harness.compare(results, args.baseline, args.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    """ Parse the command line arguments. """
+    parser = argparse.ArgumentParser(description="Run the engine benchmarks")
+    parser.add_argument("--output", type=Path, help="write the results to a JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare the results to a JSON file from an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="how much slower a case can be than the baseline before it counts as a regression (default 0.1)"
+    )
+    parser.add_argument("--filter", help="only run cases with this in their name")
+    parser.add_argument("--max-size", type=int, help="skip sizes larger than this")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs for each case (default 5)")
+    parser.add_argument("--seed", type=int, default=1234, help="random seed (default 1234)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
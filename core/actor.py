@@ -1,17 +1,57 @@
 from __future__ import annotations
+from core.datatypes.rect import Rect
 from core.entity import Entity
 from core.utilities import math_utils
 
-from typing import Callable, Optional
+from math import floor
+from typing import Callable, Iterator, Optional
 
 
 class Actor(Entity):
+    STATE_FORMAT = Entity.STATE_FORMAT + "dd"
+
     def __init__(self) -> None:
         super().__init__()
 
         # Fractional position for movement
-        self._x_remainder = 0
-        self._y_remainder = 0
+        self._x_fraction = 0
+        self._y_fraction = 0
+
+        # If this is enabled, movement finds the first contact in a single query instead of moving one pixel at a time.
+        # Collisions are reported exactly the same way in both modes.
+        self.swept_movement = False
+
+        # Reusable rectangles for collision queries
+        self._query_rect = Rect.empty()
+        self._swept_rect = Rect.empty()
+
+    @property
+    def _x_remainder(self) -> float:
+        """ The fractional X position that hasn't been applied yet. """
+        if self._components is None:
+            return self._x_fraction
+        return self._components.x_remainder[self._component_index]
+
+    @_x_remainder.setter
+    def _x_remainder(self, value: float) -> None:
+        if self._components is None:
+            self._x_fraction = value
+        else:
+            self._components.x_remainder[self._component_index] = value
+
+    @property
+    def _y_remainder(self) -> float:
+        """ The fractional Y position that hasn't been applied yet. """
+        if self._components is None:
+            return self._y_fraction
+        return self._components.y_remainder[self._component_index]
+
+    @_y_remainder.setter
+    def _y_remainder(self, value: float) -> None:
+        if self._components is None:
+            self._y_fraction = value
+        else:
+            self._components.y_remainder[self._component_index] = value
 
     def move_x(self, amount: float, collision_callback: Optional[Callable] = None) -> None:
         """ Move the actor horizontally.
@@ -31,6 +71,11 @@ class Actor(Entity):
             # Get the movement direction
             direction = math_utils.sign(move)
 
+            # Jump straight to the first contact
+            if self.swept_movement:
+                self._move_swept(move, 0, collision_callback)
+                return
+
             # Move one pixel at a time
             while move != 0:
                 new_x = self.x + direction
@@ -67,6 +112,11 @@ class Actor(Entity):
             # Get the movement direction
             direction = math_utils.sign(move)
 
+            # Jump straight to the first contact
+            if self.swept_movement:
+                self._move_swept(0, move, collision_callback)
+                return
+
             # Move one pixel at a time
             while move != 0:
                 new_y = self.y + direction
@@ -87,10 +137,77 @@ class Actor(Entity):
 
     def check_collisions(self, x: int, y: int) -> list[Entity]:
         """ Check to see if the actor will have a collision with another entity at a specific position. """
-        collisions = []
-        for actor in self.scene.actors:
-            if actor == self:
-                continue
-            if self.bbox_at(x, y).intersects(actor.bbox):
-                collisions.append(actor)
+        collisions = self.scene.spatial_hash.query(self.bbox_at(x, y, self._query_rect))
+        if self in collisions:
+            collisions.remove(self)
         return collisions
+
+    def _bounds_changed(self) -> None:
+        # Keep the scene's broadphase up to date
+        if self.scene:
+            self.scene.spatial_hash.update(self)
+
+    def save_state(self) -> tuple:
+        return super().save_state() + (self._x_remainder, self._y_remainder)
+
+    def load_state(self, values: Iterator) -> None:
+        super().load_state(values)
+        self._x_remainder = next(values)
+        self._y_remainder = next(values)
+
+    def _move_swept(self, move_x: int, move_y: int, collision_callback: Optional[Callable] = None) -> None:
+        """ Move along one axis by a whole number of pixels, stopping at the first contact.
+        This gives the same result as moving one pixel at a time, but only needs a single broadphase query.
+        """
+        distance = abs(move_x + move_y)
+        step_x = math_utils.sign(move_x) if move_x else 0
+        step_y = math_utils.sign(move_y) if move_y else 0
+        bbox = self.bbox
+
+        # Find everything that could be touched along the way
+        swept = self._swept_rect.set(
+            min(bbox.left + step_x, bbox.left + move_x),
+            min(bbox.top + step_y, bbox.top + move_y),
+            bbox.width + distance - 1 if step_x else bbox.width,
+            bbox.height + distance - 1 if step_y else bbox.height
+        )
+
+        # Find the first step that would overlap another actor
+        first_contact = distance + 1
+        for actor in self.scene.spatial_hash.query(swept):
+            if actor is self:
+                continue
+            other = actor.bbox
+
+            # The distance to the leading edge, and the distance until the actor is passed completely
+            if step_x > 0:
+                gap, extent = other.left - bbox.right, other.right - bbox.left
+            elif step_x < 0:
+                gap, extent = bbox.left - other.right, bbox.right - other.left
+            elif step_y > 0:
+                gap, extent = other.top - bbox.bottom, other.bottom - bbox.top
+            else:
+                gap, extent = bbox.top - other.bottom, bbox.bottom - other.top
+
+            steps = max(1, floor(gap) + 1)
+            if steps < extent and steps < first_contact:
+                first_contact = steps
+
+        # Move up to the contact point
+        steps = min(first_contact - 1, distance)
+        if steps:
+            if step_x:
+                self.x += step_x * steps
+            else:
+                self.y += step_y * steps
+
+        if first_contact > distance:
+            return
+
+        # Report collisions at the contact point
+        collisions = self.check_collisions(self.x + step_x, self.y + step_y)
+        for entity in collisions:
+            self.on_collide(entity)
+            entity.on_collide(self)
+            if collision_callback:
+                collision_callback(entity)
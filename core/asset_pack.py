@@ -0,0 +1,291 @@
+""" A single-file pack of pre-decoded content.
+
+Images are stored as raw RGBA pixels, audio as PCM in the mixer's output format, and everything else as the
+original file bytes. The pack is memory-mapped, so SDL can use the pixels and samples where they are, without
+decoding or copying them.
+
+Build a pack with:
+    python -m core.asset_pack [content folder] [pack file]
+
+The pack records the size and modification time of each source file, so a pack that is out of date with the content
+folder can be found with 'stale_files'.
+"""
+from __future__ import annotations
+
+import ctypes
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from PIL.Image import Image
+    import sdl2
+
+
+# Header: magic, version, index offset, index length
+PACK_MAGIC = b"PONGPACK"
+PACK_VERSION = 2
+HEADER_FORMAT = "<8sIQQ"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Data blocks start on this boundary
+ALIGNMENT = 16
+
+IMAGE_SUFFIXES = (".png", )
+AUDIO_SUFFIXES = (".wav", )
+
+
+class AssetPack:
+    """ A memory-mapped pack of content, built by 'build_pack'. """
+    def __init__(self, pack_file: Path) -> None:
+        self._pack_file = pack_file
+
+        # The map is copy-on-write, so its memory can be handed to ctypes without changing the file
+        with open(pack_file, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, version, index_offset, index_length = struct.unpack_from(HEADER_FORMAT, self._map)
+        if magic != PACK_MAGIC:
+            raise RuntimeError(f"{pack_file.as_posix()} is not a content pack")
+        if version != PACK_VERSION:
+            raise RuntimeError(f"{pack_file.as_posix()} is pack version {version}, expected {PACK_VERSION}")
+
+        index = json.loads(self._map[index_offset:index_offset + index_length])
+        self._entries: dict[str, dict] = index["entries"]
+
+        # Views into the map. They are kept alive with the pack, since SDL holds pointers into them.
+        self._buffers: dict[str, ctypes.Array] = dict()
+
+    def __contains__(self, content_path: str) -> bool:
+        return content_path in self._entries
+
+    @property
+    def pack_file(self) -> Path:
+        """ The path to the pack file. """
+        return self._pack_file
+
+    def stale_files(self, content_root: Path) -> list[str]:
+        """ Get the content path of every entry whose source file in the content folder has changed or been removed
+        since the pack was built.
+        """
+        stale = list()
+        for content_path, entry in self._entries.items():
+            try:
+                stat = os.stat(content_root / content_path)
+            except FileNotFoundError:
+                stale.append(content_path)
+                continue
+            if stat.st_size != entry["source_size"] or stat.st_mtime_ns != entry["source_mtime"]:
+                stale.append(content_path)
+        return sorted(stale)
+
+    def images(self) -> list[str]:
+        """ Get the content path of every image in the pack. """
+        return sorted(name for name, entry in self._entries.items() if entry["type"] == "image")
+
+    def image_size(self, content_path: str) -> tuple[int, int]:
+        """ Get the width and height of an image. """
+        entry = self._entries[content_path]
+        return entry["width"], entry["height"]
+
+    def buffer(self, content_path: str) -> ctypes.Array:
+        """ Get the raw data for an entry, as a ctypes array that points into the map. """
+        data = self._buffers.get(content_path)
+        if data is None:
+            entry = self._entries[content_path]
+            data = (ctypes.c_ubyte * entry["length"]).from_buffer(self._map, entry["offset"])
+            self._buffers[content_path] = data
+        return data
+
+    def surface(self, content_path: str) -> sdl2.SDL_Surface:
+        """ Create an SDL surface that uses an image's pixels in place.
+        The surface must be freed with SDL_FreeSurface. The pixels belong to the pack.
+        """
+        import sdl2
+        import sdl2.ext
+
+        width, height = self.image_size(content_path)
+        pixels = self.buffer(content_path)
+        surface = sdl2.SDL_CreateRGBSurfaceWithFormatFrom(
+            pixels, width, height, 32, width * 4, sdl2.SDL_PIXELFORMAT_RGBA32
+        )
+        if not surface:
+            raise sdl2.ext.SDLError()
+        return surface
+
+    def image(self, content_path: str) -> Image:
+        """ Get a PIL image that reads an image's pixels in place. """
+        from PIL import Image
+
+        entry = self._entries[content_path]
+        view = memoryview(self._map)[entry["offset"]:entry["offset"] + entry["length"]]
+        return Image.frombuffer("RGBA", self.image_size(content_path), view, "raw", "RGBA", 0, 1)
+
+    def audio(self, content_path: str):
+        """ Create a mixer chunk that plays a sound's samples in place.
+        If the mixer was opened with a different format than the pack was built for, the samples are converted.
+        """
+        import sdl2.ext
+        import sdl2.sdlmixer
+
+        entry = self._entries[content_path]
+        data = self.buffer(content_path)
+
+        # Make sure the samples match the mixer
+        spec = mixer_spec()
+        source = (entry["frequency"], entry["format"], entry["channels"])
+        if spec != source:
+            converted = convert_audio(data, source, spec)
+            data = (ctypes.c_ubyte * len(converted)).from_buffer_copy(converted)
+            self._buffers[content_path] = data
+
+        audio = sdl2.sdlmixer.Mix_QuickLoad_RAW(data, len(data))
+        if not audio:
+            raise sdl2.ext.SDLError(sdl2.sdlmixer.Mix_GetError())
+        return audio
+
+
+def mixer_spec() -> tuple[int, int, int]:
+    """ Get the frequency, format and channel count that the mixer was opened with. """
+    import sdl2
+    import sdl2.sdlmixer
+
+    frequency = ctypes.c_int()
+    audio_format = sdl2.Uint16()
+    channels = ctypes.c_int()
+    if not sdl2.sdlmixer.Mix_QuerySpec(frequency, audio_format, channels):
+        return default_mixer_spec()
+    return frequency.value, audio_format.value, channels.value
+
+
+def default_mixer_spec() -> tuple[int, int, int]:
+    """ Get the frequency, format and channel count that the game opens the mixer with. """
+    import sdl2.sdlmixer
+    return (
+        sdl2.sdlmixer.MIX_DEFAULT_FREQUENCY,
+        sdl2.sdlmixer.MIX_DEFAULT_FORMAT,
+        sdl2.sdlmixer.MIX_DEFAULT_CHANNELS
+    )
+
+
+def convert_audio(data, source: tuple[int, int, int], target: tuple[int, int, int]) -> bytes:
+    """ Convert PCM samples from one frequency, format and channel count to another. """
+    import sdl2
+    import sdl2.ext
+
+    source_frequency, source_format, source_channels = source
+    target_frequency, target_format, target_channels = target
+
+    cvt = sdl2.SDL_AudioCVT()
+    needed = sdl2.SDL_BuildAudioCVT(
+        cvt,
+        source_format, source_channels, source_frequency,
+        target_format, target_channels, target_frequency
+    )
+    if needed < 0:
+        raise sdl2.ext.SDLError()
+    if needed == 0:
+        return bytes(data)
+
+    # Conversion happens in place, in a buffer that is large enough for the result
+    length = len(data)
+    buffer = (ctypes.c_ubyte * (length * cvt.len_mult))()
+    ctypes.memmove(buffer, data, length)
+    cvt.buf = ctypes.cast(buffer, ctypes.POINTER(sdl2.Uint8))
+    cvt.len = length
+    if sdl2.SDL_ConvertAudio(cvt) != 0:
+        raise sdl2.ext.SDLError()
+    return bytes(buffer[:cvt.len_cvt])
+
+
+def load_wav(audio_file: Path, target: tuple[int, int, int]) -> bytes:
+    """ Load a WAV file, and convert it to PCM in the target format. """
+    import sdl2
+    import sdl2.ext
+
+    spec = sdl2.SDL_AudioSpec(0, 0, 0, 0)
+    samples = ctypes.POINTER(sdl2.Uint8)()
+    length = sdl2.Uint32()
+    if not sdl2.SDL_LoadWAV(audio_file.as_posix().encode("utf-8"), spec, ctypes.byref(samples), ctypes.byref(length)):
+        raise sdl2.ext.SDLError()
+
+    try:
+        data = ctypes.cast(samples, ctypes.POINTER(ctypes.c_ubyte * length.value)).contents
+        return convert_audio(data, (spec.freq, spec.format, spec.channels), target)
+    finally:
+        sdl2.SDL_FreeWAV(samples)
+
+
+def build_pack(content_root: Path, pack_file: Path, audio_spec: Optional[tuple[int, int, int]] = None) -> int:
+    """ Pack every file in a content folder into one file.
+    Returns the number of files that were packed.
+    """
+    from PIL import Image
+
+    if audio_spec is None:
+        audio_spec = default_mixer_spec()
+    frequency, audio_format, channels = audio_spec
+
+    entries = dict()
+    with open(pack_file, "wb") as f:
+        # The header is written last, once the index offset is known
+        f.write(bytes(HEADER_SIZE))
+
+        for content_file in sorted(content_root.rglob("*")):
+            if not content_file.is_file():
+                continue
+            content_path = content_file.relative_to(content_root).as_posix()
+            suffix = content_file.suffix.lower()
+
+            if suffix in IMAGE_SUFFIXES:
+                with Image.open(content_file) as image:
+                    image = image.convert("RGBA")
+                    data = image.tobytes()
+                    entry = {"type": "image", "width": image.width, "height": image.height}
+            elif suffix in AUDIO_SUFFIXES:
+                data = load_wav(content_file, audio_spec)
+                entry = {"type": "audio", "frequency": frequency, "format": audio_format, "channels": channels}
+            else:
+                data = content_file.read_bytes()
+                entry = {"type": "file"}
+
+            # Align the start of the block
+            f.write(bytes(-f.tell() % ALIGNMENT))
+            entry["offset"] = f.tell()
+            entry["length"] = len(data)
+            stat = content_file.stat()
+            entry["source_size"] = stat.st_size
+            entry["source_mtime"] = stat.st_mtime_ns
+            f.write(data)
+            entries[content_path] = entry
+
+        index = json.dumps({"entries": entries}).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index)
+
+        f.seek(0)
+        f.write(struct.pack(HEADER_FORMAT, PACK_MAGIC, PACK_VERSION, index_offset, len(index)))
+
+    return len(entries)
+
+
+def main() -> int:
+    # SDL must be initialized before the content module imports it
+    from core.utilities.sdl_init import initialize_sdl
+    initialize_sdl(headless=True)
+
+    from core.content import CONTENT_ROOT, PACK_FILE
+    content_root = Path(sys.argv[1]) if len(sys.argv) > 1 else CONTENT_ROOT
+    pack_file = Path(sys.argv[2]) if len(sys.argv) > 2 else PACK_FILE
+
+    count = build_pack(content_root, pack_file)
+    print(f"Packed {count} files into {pack_file.as_posix()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+
+from core.datatypes.rect import Rect
+
+if TYPE_CHECKING:
+    from core.actor import Actor
+    from core.spatial_hash import SpatialHash
+
+
+class ComponentStore:
+    """ Stores actor components in contiguous arrays, one element per actor.
+    Position, movement remainder, size, pivot and velocity for every bound actor live here,
+    and the actor's properties read and write straight into the arrays.
+    Once per fixed step, 'step' moves every actor by its velocity and keeps it inside the bounds in a single pass.
+    """
+    FIELDS = (
+        "x", "y",
+        "x_remainder", "y_remainder",
+        "width", "height",
+        "pivot_x", "pivot_y",
+        "velocity_x", "velocity_y",
+    )
+
+    def __init__(self, bounds: Optional[Rect] = None, spatial_hash: Optional[SpatialHash] = None, capacity: int = 64) -> None:
+        # If set, actors that are moved by the store are kept inside these bounds
+        self.bounds = bounds
+
+        # If set, this broadphase is updated for actors that move into different cells
+        self.spatial_hash = spatial_hash
+
+        # Component arrays
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.x_remainder = np.zeros(capacity)
+        self.y_remainder = np.zeros(capacity)
+        self.width = np.zeros(capacity)
+        self.height = np.zeros(capacity)
+        self.pivot_x = np.zeros(capacity)
+        self.pivot_y = np.zeros(capacity)
+        self.velocity_x = np.zeros(capacity)
+        self.velocity_y = np.zeros(capacity)
+
+        # Slot bookkeeping
+        self._active = np.zeros(capacity, dtype=bool)
+        self._actors: list[Optional[Actor]] = [None] * capacity
+        self._free: list[int] = list(reversed(range(capacity)))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._active))
+
+    def __contains__(self, actor: Actor) -> bool:
+        return actor._components is self
+
+    @property
+    def capacity(self) -> int:
+        """ The number of actors that can be stored before the arrays grow. """
+        return len(self._actors)
+
+    def bind(self, actor: Actor) -> None:
+        """ Move an actor's components into the store. """
+        if actor._components is not None:
+            raise RuntimeError(f"{actor} is already bound to a component store")
+
+        if not self._free:
+            self._grow()
+        index = self._free.pop()
+
+        # Copy the current values into the arrays
+        self.x[index] = actor.x
+        self.y[index] = actor.y
+        self.x_remainder[index] = actor._x_remainder
+        self.y_remainder[index] = actor._y_remainder
+        self.width[index] = actor.width
+        self.height[index] = actor.height
+        self.pivot_x[index] = actor.pivot.x
+        self.pivot_y[index] = actor.pivot.y
+        self.velocity_x[index] = 0
+        self.velocity_y[index] = 0
+
+        self._active[index] = True
+        self._actors[index] = actor
+        actor._components = self
+        actor._component_index = index
+
+    def unbind(self, actor: Actor) -> None:
+        """ Move an actor's components out of the store, back onto the actor. """
+        if actor._components is not self:
+            return
+
+        index = actor._component_index
+        x, y = self.x[index].item(), self.y[index].item()
+        x_remainder, y_remainder = self.x_remainder[index].item(), self.y_remainder[index].item()
+        width, height = self.width[index].item(), self.height[index].item()
+
+        self._active[index] = False
+        self._actors[index] = None
+        self._free.append(index)
+
+        actor._components = None
+        actor._component_index = -1
+        actor._x, actor._y = x, y
+        actor._x_remainder, actor._y_remainder = x_remainder, y_remainder
+        actor._width, actor._height = width, height
+
+    def set_velocity(self, actor: Actor, x: float, y: float) -> None:
+        """ Set the distance that an actor is moved by the store every step. """
+        self.velocity_x[actor._component_index] = x
+        self.velocity_y[actor._component_index] = y
+
+    def velocity(self, actor: Actor) -> tuple[float, float]:
+        """ Get the distance that an actor is moved by the store every step. """
+        index = actor._component_index
+        return self.velocity_x[index].item(), self.velocity_y[index].item()
+
+    def step(self) -> None:
+        """ Move every actor by its velocity, and clamp it to the bounds.
+        Movement works like 'Actor.move_x' and 'Actor.move_y': whole pixels are applied, and the fraction is kept
+        in the remainder. Actors moved by the store don't check for collisions.
+        """
+        moving = self._active & ((self.velocity_x != 0) | (self.velocity_y != 0))
+        indices = np.flatnonzero(moving)
+        if len(indices) == 0:
+            return
+
+        # Integrate
+        x_remainder = self.x_remainder[indices] + self.velocity_x[indices]
+        y_remainder = self.y_remainder[indices] + self.velocity_y[indices]
+        move_x = np.rint(x_remainder)
+        move_y = np.rint(y_remainder)
+        self.x_remainder[indices] = x_remainder - move_x
+        self.y_remainder[indices] = y_remainder - move_y
+        old_x = self.x[indices]
+        old_y = self.y[indices]
+        x = old_x + move_x
+        y = old_y + move_y
+
+        # Keep the bounding boxes inside the bounds
+        width = self.width[indices]
+        height = self.height[indices]
+        offset_x = np.trunc(self.pivot_x[indices] * width)
+        offset_y = np.trunc(self.pivot_y[indices] * height)
+        if self.bounds:
+            x = np.clip(x, self.bounds.left + offset_x, self.bounds.right - width + offset_x)
+            y = np.clip(y, self.bounds.top + offset_y, self.bounds.bottom - height + offset_y)
+
+        self.x[indices] = x
+        self.y[indices] = y
+
+        # Update the broadphase for actors that moved into different cells
+        if self.spatial_hash is not None:
+            size = self.spatial_hash.cell_size
+            changed = (
+                (np.floor((old_x - offset_x) / size) != np.floor((x - offset_x) / size)) |
+                (np.floor((old_y - offset_y) / size) != np.floor((y - offset_y) / size)) |
+                (np.floor((old_x - offset_x + width - 1) / size) != np.floor((x - offset_x + width - 1) / size)) |
+                (np.floor((old_y - offset_y + height - 1) / size) != np.floor((y - offset_y + height - 1) / size))
+            )
+            actors = self._actors
+            for index in indices[changed].tolist():
+                self.spatial_hash.update(actors[index])
+
+    def _grow(self) -> None:
+        """ Double the capacity of the arrays. """
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        for field in self.FIELDS:
+            array = getattr(self, field)
+            grown = np.zeros(new_capacity)
+            grown[:old_capacity] = array
+            setattr(self, field, grown)
+
+        active = np.zeros(new_capacity, dtype=bool)
+        active[:old_capacity] = self._active
+        self._active = active
+
+        self._actors.extend([None] * old_capacity)
+        self._free.extend(reversed(range(old_capacity, new_capacity)))
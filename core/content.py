@@ -1,17 +1,106 @@
+from __future__ import annotations
+
+import os
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Hashable, Iterable, Optional, TYPE_CHECKING
 
-import sdl2.ext
-import sdl2.sdlmixer
-from PIL import Image
+import sdl2
 
+from core.asset_pack import AssetPack
+from core.content_cache import ContentCache
+from core.datatypes.rect import Rect
 from core.engine import Engine
+from core.glyph_atlas import GlyphAtlas
+from core.null_renderer import NullTexture
+from core.preload import PreloadRequest, decode_image, read_file
+from core.texture_atlas import TextureAtlas, TextureRegion
+from core.utilities.sdl_init import ensure_mixer
+
+if TYPE_CHECKING:
+    import sdl2.ext
 
 
 CONTENT_ROOT = Path(__file__).parent.parent / "content"
+PACK_FILE = Path(__file__).parent.parent / "content.pack"
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def read_image_size(image_file: Path) -> tuple[int, int]:
+    """ Read the width and height of an image, without decoding it.
+    PNG headers are read directly, so PIL doesn't need to be imported.
+    """
+    with open(image_file, "rb") as f:
+        header = f.read(24)
+    if header[:8] == PNG_SIGNATURE and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+
+    from PIL import Image
+    with Image.open(image_file) as image:
+        return image.size
 
 
 class Content:
-    __loaded_content = dict()
+    # Loaded assets.
+    # Every load adds a reference for the scene that is current at the time, and those references are released
+    # when the scene ends.
+    __cache = ContentCache()
+
+    # If this is enabled, every image in the content folder is packed into shared atlas pages the first time a
+    # region is loaded
+    use_atlas = True
+    __atlas = None
+
+    # Background loading
+    # Files are decoded by a pool of worker threads, and uploaded on the main thread
+    __executor: Optional[ThreadPoolExecutor] = None
+    __pending: dict[str, Future] = dict()
+    __requests: list[PreloadRequest] = list()
+
+    # If a pack is mounted, content in it is loaded from the pack instead of the content folder
+    __pack: Optional[AssetPack] = None
+
+    @classmethod
+    def cache(cls) -> ContentCache:
+        """ The cache that holds all loaded content. """
+        return cls.__cache
+
+    @classmethod
+    def current_scope(cls) -> Hashable:
+        """ The scope that content references are added to - the engine's current scene. """
+        engine = Engine.instance()
+        return engine.scene if engine else None
+
+    @classmethod
+    def release_scope(cls, scope: Hashable) -> None:
+        """ Release every content reference that was added while a scope was current. """
+        cls.__cache.release_scope(scope)
+
+    @classmethod
+    def pack(cls) -> Optional[AssetPack]:
+        """ The mounted asset pack, if there is one. """
+        return cls.__pack
+
+    @classmethod
+    def mount_pack(cls, pack_file: Path = PACK_FILE) -> AssetPack:
+        """ Load content from a pack built by 'core.asset_pack', instead of from the content folder.
+        Raises a RuntimeError if any file in the pack has changed in the content folder since it was built.
+        """
+        pack = AssetPack(pack_file)
+        stale = pack.stale_files(CONTENT_ROOT)
+        if stale:
+            raise RuntimeError(f"{pack_file.as_posix()} is out of date with {', '.join(stale)}")
+
+        cls.__pack = pack
+        cls.__atlas = None
+        return cls.__pack
+
+    @classmethod
+    def in_pack(cls, content_path: str) -> bool:
+        """ Check if content will be loaded from the mounted pack. """
+        return cls.__pack is not None and content_path in cls.__pack
 
     @classmethod
     def full_content_path(cls, content_path: str) -> Path:
@@ -22,39 +111,310 @@ class Content:
         return full_path
 
     @classmethod
-    def load_texture(cls, content_path: str) -> sdl2.ext.Texture:
-        if content_path not in cls.__loaded_content:
-            # Load image
-            image_file = cls.full_content_path(content_path)
+    def load_texture(cls, content_path: str) -> sdl2.ext.Texture | NullTexture:
+        key = ("texture", content_path)
+        if key not in cls.__cache:
+            # When running headless, only the image size is needed
+            engine = Engine.instance()
+            if engine.headless and cls.in_pack(content_path):
+                cls.__cache.add(key, NullTexture(*cls.__pack.image_size(content_path)), 0)
+            elif engine.headless:
+                image_size = read_image_size(cls.full_content_path(content_path))
+                cls.__cache.add(key, NullTexture(*image_size), 0)
+            else:
+                cls._upload_texture(content_path)
 
-            # Convert from PIL Image to SDL surface
-            image = Image.open(image_file).convert("RGBA")
-            surface = sdl2.ext.pillow_to_surface(image)
+        return cls.__cache.acquire(key, cls.current_scope())
 
-            # Create texture
-            engine = Engine.instance()
-            renderer = engine.renderer.sdlrenderer
-            texture = sdl2.ext.Texture(renderer, surface)
+    @classmethod
+    def load_region(cls, content_path: str) -> TextureRegion:
+        """ Load an image as a region of a texture.
+        If the atlas is enabled, the region is part of a shared atlas page. Otherwise, it covers a whole texture.
+        """
+        if cls.use_atlas and not Engine.instance().headless:
+            atlas = cls.load_atlas()
+            if content_path in atlas:
+                page_index, rect = atlas.region(content_path)
+                return TextureRegion(cls.load_atlas_page(page_index), rect)
+
+        texture = cls.load_texture(content_path)
+        return TextureRegion(texture, Rect(0, 0, *texture.size))
+
+    @classmethod
+    def atlas_page_index(cls, content_path: str) -> Optional[int]:
+        """ Get the atlas page that an image is on, or None if it isn't in the atlas. """
+        if cls.use_atlas and not Engine.instance().headless:
+            atlas = cls.load_atlas()
+            if content_path in atlas:
+                return atlas.region(content_path)[0]
+        return None
+
+    @classmethod
+    def load_atlas(cls) -> TextureAtlas:
+        """ Work out where every image in the content folder goes in the atlas.
+        Only the image sizes are read here. Pages are created by 'load_atlas_page'.
+        """
+        if cls.__atlas is None:
+            sizes = dict()
+            if cls.__pack is not None:
+                for content_path in cls.__pack.images():
+                    sizes[content_path] = cls.__pack.image_size(content_path)
+            else:
+                for image_file in sorted(CONTENT_ROOT.rglob("*.png")):
+                    content_path = image_file.relative_to(CONTENT_ROOT).as_posix()
+                    sizes[content_path] = read_image_size(image_file)
 
-            # Cache content
-            cls.__loaded_content[content_path] = texture
+            atlas = TextureAtlas()
+            atlas.pack(sizes)
+            cls.__atlas = atlas
 
-        return cls.__loaded_content[content_path]
+        return cls.__atlas
 
     @classmethod
-    def load_font(cls, content_path: str, size: int, color: sdl2.ext.Color) -> sdl2.ext.ttf.FontTTF:
-        key = f"{content_path}.{size}.{color.r}.{color.g}.{color.b}.{color.a}"
-        if key not in cls.__loaded_content:
-            font_file = cls.full_content_path(content_path)
-            cls.__loaded_content[key] = sdl2.ext.ttf.FontTTF(font_file.as_posix(), size, color)
+    def load_atlas_page(cls, page_index: int) -> sdl2.ext.Texture:
+        """ Load the texture for an atlas page. """
+        key = ("atlas", page_index)
+        if key not in cls.__cache:
+            cls._upload_atlas_page(page_index)
 
-        return cls.__loaded_content[key]
+        return cls.__cache.acquire(key, cls.current_scope())
+
+    @classmethod
+    def load_glyph_atlas(cls, content_path: str, size: int) -> GlyphAtlas:
+        """ Load a font at a given size, with every glyph rasterized onto one texture. """
+        key = ("glyphs", content_path, size)
+        if key not in cls.__cache:
+            if cls.in_pack(content_path):
+                font_file = cls.__pack.buffer(content_path)
+                memory = len(font_file)
+            elif cls._is_preloaded_file(content_path):
+                font_file = cls._read_preloaded_file(content_path)
+                memory = len(font_file)
+            else:
+                font_file = cls.full_content_path(content_path)
+                memory = font_file.stat().st_size
+
+            engine = Engine.instance()
+            renderer = None if engine.headless else engine.renderer.sdlrenderer
+            glyph_atlas = GlyphAtlas(font_file, size, renderer)
+
+            if glyph_atlas.texture:
+                memory += glyph_atlas.texture.size[0] * glyph_atlas.texture.size[1] * 4
+            cls.__cache.add(key, glyph_atlas, memory, GlyphAtlas.destroy)
+
+        return cls.__cache.acquire(key, cls.current_scope())
 
     @classmethod
     def load_audio(cls, content_path: str):
-        if content_path not in cls.__loaded_content:
+        key = ("audio", content_path)
+        if key not in cls.__cache:
+            if not cls.in_pack(content_path):
+                cls.full_content_path(content_path)
+
+            # There is no audio device when running headless
+            if Engine.instance().headless:
+                return None
+
+            cls._upload_audio(content_path)
+
+        return cls.__cache.acquire(key, cls.current_scope())
+
+    @classmethod
+    def preload(cls, content_paths: Iterable[str]) -> PreloadRequest:
+        """ Start loading content in the background.
+        Files are decoded on worker threads. 'process_preloads' hands them to the GPU and audio device on the main
+        thread, a few at a time. Preloaded content is cached without a reference, until something loads it.
+        """
+        request = PreloadRequest(content_paths)
+        headless = Engine.instance().headless
+
+        for content_path in request.content_paths:
+            if not cls.in_pack(content_path):
+                cls.full_content_path(content_path)
+            suffix = Path(content_path).suffix.lower()
+
+            # Content that was already uploaded doesn't need to be decoded again
+            if suffix in (".png", ".wav") and cls._is_uploaded(content_path):
+                continue
+
+            # Images on an atlas page are uploaded together, so they all need to be decoded
+            if suffix == ".png":
+                page_index = cls.atlas_page_index(content_path)
+                if page_index is None:
+                    decode_paths = [content_path]
+                else:
+                    decode_paths = cls.load_atlas().page_contents(page_index)
+            else:
+                decode_paths = [content_path]
+
+            for decode_path in decode_paths:
+                # Skip files that are already being read, and content in the pack, which is already decoded
+                if cls._is_preloaded_file(decode_path) or cls.in_pack(decode_path):
+                    continue
+
+                suffix = Path(decode_path).suffix.lower()
+                if headless and suffix in (".png", ".wav"):
+                    continue
+
+                worker = decode_image if suffix == ".png" else read_file
+                cls.__pending[decode_path] = cls._executor().submit(worker, cls.full_content_path(decode_path))
+
+        cls.__requests.append(request)
+        cls.process_preloads(0)
+        return request
+
+    @classmethod
+    def process_preloads(cls, max_uploads: Optional[int] = 4) -> int:
+        """ Upload content that has finished decoding in the background. This must run on the main thread.
+        At most 'max_uploads' files are uploaded per call, so the frame loop isn't stalled.
+        Returns the number of files that were uploaded.
+        """
+        if not cls.__requests:
+            return 0
+
+        uploads = 0
+        for request in cls.__requests:
+            for content_path in request.content_paths:
+                if max_uploads is not None and uploads >= max_uploads:
+                    break
+                if cls._is_uploaded(content_path):
+                    request.complete(content_path)
+                    continue
+                if cls._upload_when_decoded(content_path):
+                    request.complete(content_path)
+                    uploads += 1
+
+        cls.__requests = [request for request in cls.__requests if not request.done]
+        return uploads
+
+    @classmethod
+    def _executor(cls) -> ThreadPoolExecutor:
+        if cls.__executor is None:
+            cls.__executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="content")
+        return cls.__executor
+
+    @classmethod
+    def _is_uploaded(cls, content_path: str) -> bool:
+        """ Check if a preloaded file is ready to use. """
+        suffix = Path(content_path).suffix.lower()
+        if Engine.instance().headless and suffix in (".png", ".wav"):
+            return True
+        if suffix == ".png":
+            page_index = cls.atlas_page_index(content_path)
+            if page_index is not None:
+                return ("atlas", page_index) in cls.__cache
+            return ("texture", content_path) in cls.__cache
+        if suffix == ".wav":
+            return ("audio", content_path) in cls.__cache
+        return content_path not in cls.__pending
+
+    @classmethod
+    def _upload_when_decoded(cls, content_path: str) -> bool:
+        """ Upload a preloaded file if it has finished decoding. Returns True if it was uploaded. """
+        suffix = Path(content_path).suffix.lower()
+        if suffix == ".png":
+            page_index = cls.atlas_page_index(content_path)
+            if page_index is not None:
+                page_contents = cls.load_atlas().page_contents(page_index)
+                if not all(cls._is_decoded(path) for path in page_contents):
+                    return False
+                cls._upload_atlas_page(page_index)
+                return True
+            if not cls._is_decoded(content_path):
+                return False
+            cls._upload_texture(content_path)
+            return True
+
+        if not cls._is_decoded(content_path):
+            return False
+        if suffix == ".wav":
+            cls._upload_audio(content_path)
+        else:
+            # Other files are kept in memory until they are loaded. Fonts are opened from there, at each size.
+            data = cls.__pending.pop(content_path).result()
+            cls.__cache.add(("file", content_path), data, len(data))
+        return True
+
+    @classmethod
+    def _is_decoded(cls, content_path: str) -> bool:
+        future = cls.__pending.get(content_path)
+        return future is None or future.done()
+
+    @classmethod
+    def _is_preloaded_file(cls, content_path: str) -> bool:
+        """ Check if a file is being read in the background, or has been read already. """
+        return content_path in cls.__pending or ("file", content_path) in cls.__cache
+
+    @classmethod
+    def _read_preloaded_file(cls, content_path: str) -> bytes:
+        """ Get the data of a preloaded file, waiting for it to be read if it hasn't been yet. """
+        future = cls.__pending.pop(content_path, None)
+        if future is not None:
+            data = future.result()
+            cls.__cache.add(("file", content_path), data, len(data))
+        return cls.__cache.get(("file", content_path))
+
+    @classmethod
+    def _decode_image(cls, content_path: str):
+        """ Get the RGBA pixels for an image, waiting for a background decode if one was started. """
+        future = cls.__pending.pop(content_path, None)
+        if future is not None:
+            return future.result()
+        if cls.in_pack(content_path):
+            return cls.__pack.image(content_path)
+        return decode_image(cls.full_content_path(content_path))
+
+    @classmethod
+    def _upload_texture(cls, content_path: str) -> None:
+        """ Create a texture for an image, and cache it. """
+        import sdl2.ext
+        renderer = Engine.instance().renderer.sdlrenderer
+
+        # Packed pixels are uploaded straight from the pack
+        if cls.in_pack(content_path):
+            width, height = cls.__pack.image_size(content_path)
+            surface = cls.__pack.surface(content_path)
+            texture = sdl2.ext.Texture(renderer, surface.contents)
+            sdl2.SDL_FreeSurface(surface)
+        else:
+            image = cls._decode_image(content_path)
+            width, height = image.size
+            texture = sdl2.ext.Texture(renderer, sdl2.ext.pillow_to_surface(image))
+
+        cls.__cache.add(("texture", content_path), texture, width * height * 4, sdl2.ext.Texture.destroy)
+
+    @classmethod
+    def _upload_atlas_page(cls, page_index: int) -> None:
+        """ Build the image for an atlas page, create a texture for it, and cache it. """
+        import sdl2.ext
+        atlas = cls.load_atlas()
+        images = dict()
+        for content_path in atlas.page_contents(page_index):
+            images[content_path] = cls._decode_image(content_path)
+        page = atlas.build_page(page_index, images)
+
+        renderer = Engine.instance().renderer.sdlrenderer
+        texture = sdl2.ext.Texture(renderer, sdl2.ext.pillow_to_surface(page))
+        cls.__cache.add(("atlas", page_index), texture, page.width * page.height * 4, sdl2.ext.Texture.destroy)
+
+    @classmethod
+    def _upload_audio(cls, content_path: str) -> None:
+        """ Load a sound into the mixer, and cache it. """
+        ensure_mixer()
+        import sdl2.ext
+        import sdl2.sdlmixer
+
+        future = cls.__pending.pop(content_path, None)
+        if cls.in_pack(content_path):
+            audio = cls.__pack.audio(content_path)
+        elif future is not None:
+            data = future.result()
+            stream = sdl2.SDL_RWFromConstMem(data, len(data))
+            audio = sdl2.sdlmixer.Mix_LoadWAV_RW(stream, 1)
+        else:
             audio_file = cls.full_content_path(content_path)
             audio = sdl2.sdlmixer.Mix_LoadWAV(audio_file.as_posix().encode("utf-8"))
-            cls.__loaded_content[content_path] = audio
 
-        return cls.__loaded_content[content_path]
+        if not audio:
+            raise sdl2.ext.SDLError(sdl2.sdlmixer.Mix_GetError())
+        cls.__cache.add(("audio", content_path), audio, audio.contents.alen, sdl2.sdlmixer.Mix_FreeChunk)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+
+class CacheEntry:
+    __slots__ = ("asset", "size", "release", "references")
+
+    def __init__(self, asset: Any, size: int, release: Optional[Callable[[Any], None]]) -> None:
+        # The loaded asset, and an estimate of how much memory it uses (in bytes)
+        self.asset = asset
+        self.size = size
+
+        # Frees the asset when it is evicted
+        self.release = release
+
+        # The number of owners that are using the asset
+        self.references = 0
+
+
+class ContentCache:
+    """ A cache of loaded assets with reference counting and a memory budget.
+    References are held by scopes (the content loader uses the current scene), and a scope's references are all
+    released at once when it ends. Owners can also release single references.
+    Assets with no references stay cached until they use more than the memory budget, then the least recently used
+    ones are freed first. Referenced assets don't count against the budget.
+    """
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> None:
+        self._memory_budget = memory_budget
+        self._memory_used = 0
+
+        # Entries in least to most recently used order
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+        # References held by each scope
+        self._scopes: dict[Hashable, Counter] = dict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def memory_used(self) -> int:
+        """ The estimated memory used by cached assets (in bytes). """
+        return self._memory_used
+
+    @property
+    def memory_budget(self) -> int:
+        """ The amount of memory that unreferenced assets can use before they are evicted (in bytes). """
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, value: int) -> None:
+        self._memory_budget = value
+        self.evict()
+
+    def get(self, key: Hashable) -> Any:
+        """ Get a cached asset, or None if it isn't loaded. """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry.asset
+
+    def add(self, key: Hashable, asset: Any, size: int, release: Optional[Callable[[Any], None]] = None) -> Any:
+        """ Add a newly loaded asset to the cache. """
+        self._entries[key] = CacheEntry(asset, size, release)
+        self._memory_used += size
+
+        # The new asset isn't referenced until its owner acquires it, so it can't be evicted yet
+        self.evict(keep=key)
+        return asset
+
+    def references(self, key: Hashable) -> int:
+        """ Get the number of references to an asset. """
+        entry = self._entries.get(key)
+        return entry.references if entry else 0
+
+    def acquire(self, key: Hashable, scope: Hashable = None) -> Any:
+        """ Add a reference to a cached asset, on behalf of an owner in a scope. """
+        entry = self._entries[key]
+        entry.references += 1
+        self._entries.move_to_end(key)
+
+        counter = self._scopes.get(scope)
+        if counter is None:
+            counter = self._scopes[scope] = Counter()
+        counter[key] += 1
+        return entry.asset
+
+    def release(self, key: Hashable, scope: Hashable = None) -> None:
+        """ Remove a reference to an asset. """
+        counter = self._scopes.get(scope)
+        if not counter or counter[key] == 0:
+            return
+
+        counter[key] -= 1
+        if counter[key] == 0:
+            del counter[key]
+        if not counter:
+            del self._scopes[scope]
+
+        entry = self._entries.get(key)
+        if entry:
+            entry.references -= 1
+        self.evict()
+
+    def release_scope(self, scope: Hashable) -> None:
+        """ Remove every reference that was acquired in a scope. """
+        counter = self._scopes.pop(scope, None)
+        if not counter:
+            return
+
+        for key, count in counter.items():
+            entry = self._entries.get(key)
+            if entry:
+                entry.references -= count
+        self.evict()
+
+    def evict(self, keep: Optional[Hashable] = None) -> None:
+        """ Free unreferenced assets, least recently used first, until they fit within the memory budget.
+        The 'keep' asset is never freed.
+        """
+        if self._memory_used <= self._memory_budget:
+            return
+
+        unreferenced = [key for key, entry in self._entries.items() if entry.references <= 0]
+        unreferenced_memory = sum(self._entries[key].size for key in unreferenced)
+        for key in unreferenced:
+            if unreferenced_memory <= self._memory_budget:
+                break
+            if key == keep:
+                continue
+            unreferenced_memory -= self._entries[key].size
+            self._free(key)
+
+    def clear(self) -> None:
+        """ Free every asset, whether or not it's referenced. """
+        for key in list(self._entries):
+            self._free(key)
+        self._scopes.clear()
+
+    def _free(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._memory_used -= entry.size
+        if entry.release:
+            entry.release(entry.asset)
@@ -1,3 +1,6 @@
+from typing import Callable, Optional
+
+
 class Pivot:
     """ A data type that represents a pivot point inside a rectangle.
     0    X    1
@@ -7,10 +10,15 @@ class Pivot:
     |    |    |
     +----+----+  1
     """
-    def __init__(self) -> None:
+    __slots__ = ("_x", "_y", "_on_change")
+
+    def __init__(self, on_change: Optional[Callable[[], None]] = None) -> None:
         self._x = 0
         self._y = 0
 
+        # Called whenever the pivot point is set
+        self._on_change = on_change
+
     @property
     def x(self) -> float:
         """ The X value for the pivot. """
@@ -29,6 +37,8 @@ class Pivot:
             raise RuntimeError(f"Pivot point values must be in range 0 to 1.")
         self._x = x
         self._y = y
+        if self._on_change:
+            self._on_change()
 
     def set_center_left(self) -> None:
         self.set(0, .5)
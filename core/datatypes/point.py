@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from copy import deepcopy
-
 
 class Point:
+    __slots__ = ("_x", "_y")
+
     def __init__(self, x: float, y: float) -> None:
         self._x = int(x)
         self._y = int(y)
@@ -51,9 +51,37 @@ class Point:
         else:
             return Point(self.x / other, self.y / other)
 
+    def __iadd__(self, other: Point) -> Point:
+        self._x = int(self._x + other.x)
+        self._y = int(self._y + other.y)
+        return self
+
+    def __isub__(self, other: Point) -> Point:
+        self._x = int(self._x - other.x)
+        self._y = int(self._y - other.y)
+        return self
+
+    def __imul__(self, other: Point | float) -> Point:
+        if isinstance(other, Point):
+            self._x = int(self._x * other.x)
+            self._y = int(self._y * other.y)
+        else:
+            self._x = int(self._x * other)
+            self._y = int(self._y * other)
+        return self
+
+    def set(self, x: float, y: float) -> Point:
+        """ Set both values of this point in place. """
+        self._x = int(x)
+        self._y = int(y)
+        return self
+
     def copy(self) -> Point:
         """ Return a copy of this point. """
-        return deepcopy(self)
+        point = Point.__new__(Point)
+        point._x = self._x
+        point._y = self._y
+        return point
 
     def to_tuple(self) -> tuple[int, int]:
         """ Return a copy of this point as a tuple. """
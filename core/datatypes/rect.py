@@ -4,48 +4,23 @@ from core.datatypes.point import Point
 
 
 class Rect:
-    def __init__(self, x: int, y: int, width: int, height: int) -> None:
-        self._x = x
-        self._y = y
-        self._width = width
-        self._height = height
-
-    @property
-    def x(self) -> int:
-        """ The X position of the top-left corner of the rectangle. """
-        return self._x
+    __slots__ = ("x", "y", "width", "height")
 
-    @x.setter
-    def x(self, value: int) -> None:
-        self._x = value
-
-    @property
-    def y(self) -> int:
-        """ The Y position of the top-left corner of the rectangle. """
-        return self._y
+    def __init__(self, x: int, y: int, width: int, height: int) -> None:
+        # The X and Y position of the top-left corner of the rectangle
+        self.x = x
+        self.y = y
 
-    @y.setter
-    def y(self, value: int) -> None:
-        self._y = value
+        # The size of the rectangle
+        self.width = width
+        self.height = height
 
-    @property
-    def width(self) -> int:
-        """ The width of the rectangle. """
-        return self._width
+    def __str__(self) -> str:
+        return f"Rect({self.x}, {self.y}, {self.width}, {self.height})"
 
-    @width.setter
-    def width(self, value: int) -> None:
-        self._width = value
+    def __repr__(self) -> str:
+        return str(self)
 
-    @property
-    def height(self) -> int:
-        """ The height of the rectangle. """
-        return self._height
-
-    @height.setter
-    def height(self, value: int) -> None:
-        self._height = value
-    
     @property
     def top(self) -> int:
         """ The Y position of the top edge of the rectangle. """
@@ -76,13 +51,25 @@ class Rect:
         """ The width and height of the rectangle. """
         return Point(self.width, self.height)
 
+    def set(self, x: int, y: int, width: int, height: int) -> Rect:
+        """ Set all of the values of this rectangle in place. """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        return self
+
+    def copy(self) -> Rect:
+        """ Return a copy of this rectangle. """
+        return Rect(self.x, self.y, self.width, self.height)
+
     def intersects(self, other: Rect) -> bool:
         """ Check if this rectangle intersects another. """
         return (
-            other.left < self.right and
-            self.left < other.right and
-            other.top < self.bottom and
-            self.top < other.bottom
+            other.x < self.x + self.width and
+            self.x < other.x + other.width and
+            other.y < self.y + self.height and
+            self.y < other.y + other.height
         )
 
     @classmethod
@@ -1,29 +1,14 @@
 from __future__ import annotations
 
-from copy import deepcopy
 from math import cos, sin, radians, sqrt
 
 
 class Vector2:
-    def __init__(self, x: float, y: float) -> None:
-        self._x = x
-        self._y = y
-
-    @property
-    def x(self) -> float:
-        return self._x
+    __slots__ = ("x", "y")
 
-    @x.setter
-    def x(self, value: float) -> None:
-        self._x = float(value)
-
-    @property
-    def y(self) -> float:
-        return self._y
-
-    @y.setter
-    def y(self, value: float) -> None:
-        self._y = float(value)
+    def __init__(self, x: float, y: float) -> None:
+        self.x = x
+        self.y = y
 
     def __str__(self) -> str:
         return f"Vector2({self.x}, {self.y})"
@@ -52,6 +37,25 @@ class Vector2:
         else:
             return Vector2(self.x / other, self.y / other)
 
+    def __iadd__(self, other: Vector2) -> Vector2:
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other: Vector2) -> Vector2:
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, other: Vector2 | float) -> Vector2:
+        if isinstance(other, Vector2):
+            self.x *= other.x
+            self.y *= other.y
+        else:
+            self.x *= other
+            self.y *= other
+        return self
+
     @property
     def length(self) -> float:
         """ The length of this vector. """
@@ -68,17 +72,27 @@ class Vector2:
         """ Return a copy of this vector as a tuple. """
         return self.x, self.y
 
+    def set(self, x: float, y: float) -> Vector2:
+        """ Set both values of this vector in place. """
+        self.x = x
+        self.y = y
+        return self
+
     def copy(self) -> Vector2:
         """ Return a copy of this vector. """
-        return deepcopy(self)
+        vector = Vector2.__new__(Vector2)
+        vector.x = self.x
+        vector.y = self.y
+        return vector
 
     def normalize(self) -> None:
         """ Normalize this vector. """
-        if self.length == 0:
-            self.x = 0
-            self.y = 0
+        length = self.length
+        if length == 0:
+            self.x = 0.0
+            self.y = 0.0
         else:
-            scale = 1 / self.length
+            scale = 1 / length
             self.x *= scale
             self.y *= scale
 
@@ -1,22 +1,40 @@
 from __future__ import annotations
 
+import random
+
 import sdl2
-import sdl2.ext
 import sdl2.render
-import sdl2.timer
 import sdl2.video
-from typing import Optional, TYPE_CHECKING
+from time import perf_counter
+from typing import Callable, Optional, TYPE_CHECKING
 
+from core.frame_timer import (
+    FrameTimer, PHASE_AFTER_UPDATE, PHASE_DRAW, PHASE_EVENTS, PHASE_PRESENT, PHASE_UPDATE, PHASE_WAIT
+)
+from core.game_random import GameRandom
 from core.input import Input
+from core.null_renderer import NullRenderer
+from core.sprite_batch import SpriteBatch
 from core.time import Time
 from core.utilities import time_utils
+from core.utilities.frame_pacer import FramePacer
+from core.utilities.startup_timer import StartupTimer
 
 if TYPE_CHECKING:
+    import sdl2.ext
+    from core.replay import InputRecorder
     from core.scene import Scene
 
 
 TIMESTEP = 1 / 60
 
+# The most fixed steps that can run before a frame is drawn.
+# If the game falls further behind than this, the extra time is dropped instead of catching up.
+MAX_CATCH_UP_STEPS = 5
+
+# If presenting takes less than this on average, it isn't waiting for vsync, so frames are paced by sleeping
+VSYNC_PRESENT_TIME = 0.001
+
 
 class Engine:
     __instance = None
@@ -26,12 +44,27 @@ class Engine:
             cls.__instance = super(Engine, cls).__new__(cls)
         return cls.__instance
 
-    def __init__(self, window: sdl2.ext.Window, renderer: sdl2.ext.Renderer) -> None:
+    def __init__(
+            self,
+            window: Optional[sdl2.ext.Window] = None,
+            renderer: Optional[sdl2.ext.Renderer] = None,
+            seed: Optional[int] = None
+    ) -> None:
+        # The engine is a singleton, so this runs again each time an engine is created.
+        # End the scene from the last run, so its content references are released.
+        previous_scene = getattr(self, "_scene", None)
+        if previous_scene:
+            previous_scene.end()
+
         # Main window
+        # If there is no window, the engine runs headless
         self._window = window
 
         # Rendering context
-        self._renderer = renderer
+        self._renderer = renderer if renderer else NullRenderer()
+
+        # Batches sprite and text quads into as few draw calls as possible
+        self._sprite_batch = SpriteBatch(renderer) if renderer else None
 
         # Tracks whether or not the event loop is running
         self._running = False
@@ -45,6 +78,22 @@ class Engine:
         self._frame_counter = 0
         self._fps_timer = 0
 
+        # How long each phase of recent frames took
+        self._frame_timer = FrameTimer()
+
+        # Sleeps between frames until the next step is due.
+        # If this is None, frames are paced whenever presenting doesn't wait for vsync.
+        self._frame_pacer = FramePacer()
+        self.frame_pacing: Optional[bool] = None
+
+        # All gameplay randomness comes from this generator, so a run can be reproduced from its seed
+        self._random = GameRandom()
+        self._seed = 0
+        self.reseed(seed)
+
+        # Records the input and state of each step, if set
+        self.input_recorder: Optional[InputRecorder] = None
+
         # Scene
         self._scene = None
         self._next_scene = None
@@ -54,15 +103,45 @@ class Engine:
         return cls.__instance
 
     @property
-    def window(self) -> sdl2.ext.Window:
+    def window(self) -> Optional[sdl2.ext.Window]:
         """ The main window for the application. """
         return self._window
 
     @property
-    def renderer(self) -> sdl2.ext.Renderer:
+    def renderer(self) -> sdl2.ext.Renderer | NullRenderer:
         """ The rendering context for the window. """
         return self._renderer
 
+    @property
+    def sprite_batch(self) -> Optional[SpriteBatch]:
+        """ The batch that sprites and text are drawn with. This is None when running headless. """
+        return self._sprite_batch
+
+    @property
+    def headless(self) -> bool:
+        """ True if the engine is running without a window, renderer or audio device. """
+        return self._window is None
+
+    @property
+    def frame_timer(self) -> FrameTimer:
+        """ Timings for the events, update, after_update, draw and present phases of recent frames. """
+        return self._frame_timer
+
+    @property
+    def frame_pacer(self) -> FramePacer:
+        """ Waits between frames when 'frame_pacing' is enabled, and tracks how precise the waits are. """
+        return self._frame_pacer
+
+    @property
+    def random(self) -> GameRandom:
+        """ The random number generator for gameplay. """
+        return self._random
+
+    @property
+    def seed(self) -> int:
+        """ The seed that the random number generator was last reset with. """
+        return self._seed
+
     @property
     def scene(self) -> Optional[Scene]:
         """ The current scene. """
@@ -81,12 +160,13 @@ class Engine:
         self.window.show()
 
         # Main event loop
+        pacer = self._frame_pacer
+        self._last_tick_time = pacer.now()
         self._running = True
         while self._running:
             # Calculate time delta
-            tick = sdl2.timer.SDL_GetTicks64()
-            delta_ms = tick - self._last_tick_time
-            delta = time_utils.snap_delta(delta_ms / 1000.0)
+            tick = pacer.now()
+            delta = time_utils.snap_delta(tick - self._last_tick_time)
             self._last_tick_time = tick
 
             # Increment the fps timer and delta time accumulator
@@ -94,30 +174,125 @@ class Engine:
             self._accumulator += delta
 
             # Update at fixed time step
-            while self._accumulator > TIMESTEP:
-                Time.update(TIMESTEP)
-                self._frame_counter += 1
+            step_count = 0
+            while self._accumulator >= TIMESTEP and step_count < MAX_CATCH_UP_STEPS:
                 self._accumulator -= TIMESTEP
-                self.update()
-                self.draw()
+                self.step()
+                step_count += 1
+
+            # Drop the time that couldn't be caught up
+            if self._accumulator >= TIMESTEP:
+                self._accumulator %= TIMESTEP
+
+            # Draw once per frame, between the last two steps
+            Time.alpha = self._accumulator / TIMESTEP
+            self.draw()
+            self._frame_counter += 1
 
             self.update_fps()
 
+            # Sleep until the next step is due, instead of spinning
+            if self.should_pace_frames():
+                start = pacer.now()
+                pacer.wait_until(tick + TIMESTEP - self._accumulator)
+                self._frame_timer.record(PHASE_WAIT, pacer.now() - start)
+
+    def run_headless(
+            self,
+            first_scene: Scene,
+            steps: Optional[int] = None,
+            stop_condition: Optional[Callable[[Engine], bool]] = None
+    ) -> int:
+        """ Runs the fixed-step loop without a window, renderer or audio device.
+        Time is simulated rather than measured, so the loop runs as fast as the CPU allows.
+        The loop ends after a number of steps, when the stop condition returns True, or when 'stop' is called.
+        Returns the number of steps that were simulated.
+        """
+        # Load the first scene
+        self.scene = first_scene
+
+        # Main loop
+        step_count = 0
+        self._running = True
+        while self._running:
+            if steps is not None and step_count >= steps:
+                break
+
+            self.step()
+            step_count += 1
+
+            if stop_condition and stop_condition(self):
+                break
+
+        self._running = False
+        return step_count
+
+    def stop(self) -> None:
+        """ Stop the main loop after the current step. """
+        self._running = False
+
+    def reseed(self, seed: Optional[int] = None) -> int:
+        """ Reset the random number generator. If no seed is given, a new one is picked.
+        Returns the seed.
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self._seed = seed
+        self._random.seed(seed)
+        return seed
+
+    def should_pace_frames(self) -> bool:
+        """ Check if the main loop should sleep until the next step is due. """
+        if self.frame_pacing is not None:
+            return self.frame_pacing
+
+        # Renderers can report vsync without waiting for it, so check how long presenting actually takes
+        present_times = self._frame_timer.samples(PHASE_PRESENT, 30)
+        if len(present_times) < 30:
+            return True
+        return sum(present_times) / len(present_times) < VSYNC_PRESENT_TIME
+
+    def step(self) -> None:
+        """ Advance the simulation by one fixed time step. """
+        Time.update(TIMESTEP)
+        self.update()
+
     def update(self) -> None:
         """ Main update loop. """
+        frame_timer = self._frame_timer
+
         # Handle events
-        self.handle_events()
+        if not self.headless:
+            start = perf_counter()
+            self.handle_events()
+            frame_timer.record(PHASE_EVENTS, perf_counter() - start)
+
+        # Record the input that this step sees
+        recorder = self.input_recorder
+        if recorder:
+            recorder.record_input(Input.keys())
 
         # Update scene
         if self.scene:
+            start = perf_counter()
             self.scene.update()
+            end = perf_counter()
+            self.scene.after_update()
+            frame_timer.record(PHASE_UPDATE, end - start)
+            frame_timer.record(PHASE_AFTER_UPDATE, perf_counter() - end)
 
         # Transition scene
         if self._scene != self._next_scene:
             self.transition_scene()
 
+        # Record the state that this step ended in
+        if recorder:
+            recorder.record_state(self.scene)
+
     def handle_events(self) -> None:
         """ Handle SDL events. """
+        # sdl2.ext is only imported when there is a window, because it also imports PIL and numpy
+        import sdl2.ext
         for event in sdl2.ext.get_events():
             match event.type:
                 case sdl2.SDL_QUIT:
@@ -133,21 +308,34 @@ class Engine:
         self._scene = self._next_scene
 
         if self.scene:
-            self.scene.load_entities()
-            self.scene.entities.update_list()
-            self.scene.start(self)
+            with StartupTimer.phase(f"Load {type(self.scene).__name__}"):
+                self.scene.load_entities()
+                self.scene.entities.update_list()
+                self.scene.start(self)
+
+        # Startup is over once the first scene has started
+        StartupTimer.finish()
 
     def draw(self) -> None:
         """ Main draw loop. """
+        start = perf_counter()
+
         # Clear screen
-        self.renderer.clear(sdl2.ext.Color(0, 0, 0))
+        self.renderer.clear((0, 0, 0))
+        if self._sprite_batch:
+            self._sprite_batch.reset_stats()
 
         # Draw scene
         if self.scene:
             self.scene.draw()
+        if self._sprite_batch:
+            self._sprite_batch.flush()
 
         # Render to screen
+        end = perf_counter()
         self.renderer.present()
+        self._frame_timer.record(PHASE_DRAW, end - start)
+        self._frame_timer.record(PHASE_PRESENT, perf_counter() - end)
 
     def update_fps(self) -> None:
         """ Update the fps. """
@@ -1,17 +1,23 @@
 from __future__ import annotations
 
-from typing import Optional, TYPE_CHECKING
+from typing import Iterator, Optional, TYPE_CHECKING
 
 from core.datatypes.pivot import Pivot
 from core.datatypes.point import Point
 from core.datatypes.rect import Rect
 
 from core.engine import Engine
+from core.time import Time
 if TYPE_CHECKING:
+    from core.component_store import ComponentStore
     from core.scene import Scene
 
 
 class Entity:
+    # Struct format of the values from 'save_state'.
+    # Subclasses that save more values append their formats to this.
+    STATE_FORMAT = "dddd"
+
     def __init__(self) -> None:
         self._name = None
         self._tags = set()
@@ -21,10 +27,18 @@ class Entity:
         self._x = 0
         self._y = 0
 
+        # Position at the start of the current fixed step, for interpolated rendering
+        self._previous_x = 0
+        self._previous_y = 0
+
         # Collision
         self._width = 0
         self._height = 0
-        self._pivot = Pivot()
+        self._pivot = Pivot(self._pivot_changed)
+
+        # If this entity is bound to a component store, its position and size live in the store's arrays
+        self._components: Optional[ComponentStore] = None
+        self._component_index = -1
 
     @property
     def name(self) -> str:
@@ -33,7 +47,10 @@ class Entity:
 
     @name.setter
     def name(self, value: str) -> None:
+        old_name = self._name
         self._name = value
+        if self.scene and value != old_name:
+            self.scene.entities.on_entity_renamed(self, old_name)
 
     @property
     def scene(self) -> Optional[Scene]:
@@ -47,42 +64,89 @@ class Entity:
     @property
     def x(self) -> int:
         """ The X position of this entity. """
-        return self._x
+        if self._components is None:
+            return self._x
+        return self._components.x[self._component_index]
 
     @x.setter
     def x(self, value: int) -> None:
-        self._x = value
+        if self._components is None:
+            self._x = value
+        else:
+            self._components.x[self._component_index] = value
+        self._bounds_changed()
 
     @property
     def y(self) -> int:
         """ The Y position of this entity. """
-        return self._y
+        if self._components is None:
+            return self._y
+        return self._components.y[self._component_index]
 
     @y.setter
     def y(self, value: int) -> None:
-        self._y = value
+        if self._components is None:
+            self._y = value
+        else:
+            self._components.y[self._component_index] = value
+        self._bounds_changed()
 
     @property
     def position(self) -> Point:
         return Point(self.x, self.y)
 
+    @property
+    def previous_position(self) -> Point:
+        """ The position at the start of the current fixed step. """
+        return Point(self._previous_x, self._previous_y)
+
+    @property
+    def render_position(self) -> Point:
+        """ The position to draw at, between the previous and current positions. """
+        alpha = Time.alpha
+        x = self.x
+        y = self.y
+        return Point(
+            round(self._previous_x + (x - self._previous_x) * alpha),
+            round(self._previous_y + (y - self._previous_y) * alpha)
+        )
+
+    def snap_previous_position(self) -> None:
+        """ Set the previous position to the current position.
+        Call this after teleporting, so the entity isn't drawn sliding from where it was.
+        """
+        self._previous_x = self.x
+        self._previous_y = self.y
+
     @property
     def width(self) -> int:
         """ The width of the bounding box. """
-        return self._width
+        if self._components is None:
+            return self._width
+        return self._components.width[self._component_index]
 
     @width.setter
     def width(self, value: int) -> None:
-        self._width = value
+        if self._components is None:
+            self._width = value
+        else:
+            self._components.width[self._component_index] = value
+        self._bounds_changed()
 
     @property
     def height(self) -> int:
         """ The height of the bounding box. """
-        return self._height
+        if self._components is None:
+            return self._height
+        return self._components.height[self._component_index]
 
     @height.setter
     def height(self, value: int) -> None:
-        self._height = value
+        if self._components is None:
+            self._height = value
+        else:
+            self._components.height[self._component_index] = value
+        self._bounds_changed()
 
     @property
     def pivot(self) -> Pivot:
@@ -94,14 +158,33 @@ class Entity:
         """ The bounding box for this entity. """
         return self.bbox_at(self.x, self.y)
 
-    def bbox_at(self, x: int, y: int) -> Rect:
-        """ Return a copy of this entity's bounding box at a given position. """
-        return Rect(
-            x - int(self.pivot.x * self.width),
-            y - int(self.pivot.y * self.height),
-            self.width,
-            self.height
-        )
+    def bbox_at(self, x: int, y: int, out: Optional[Rect] = None) -> Rect:
+        """ Return a copy of this entity's bounding box at a given position.
+        If a rectangle is passed to 'out', it is filled in and returned instead of allocating a new one.
+        """
+        width = self.width
+        height = self.height
+        left = x - int(self._pivot.x * width)
+        top = y - int(self._pivot.y * height)
+        if out is None:
+            return Rect(left, top, width, height)
+        return out.set(left, top, width, height)
+
+    def _pivot_changed(self) -> None:
+        """ Called when the pivot point of this entity is set. """
+        if self._components is not None:
+            self._components.pivot_x[self._component_index] = self._pivot.x
+            self._components.pivot_y[self._component_index] = self._pivot.y
+        self._bounds_changed()
+
+    def _bounds_changed(self) -> None:
+        """ Called when the position, size or pivot of this entity changes. """
+        pass
+
+    @property
+    def tags(self) -> frozenset[str]:
+        """ The tags on this entity. """
+        return frozenset(self._tags)
 
     def has_tag(self, tag: str) -> bool:
         """ Check if a tag is on this entity. """
@@ -109,7 +192,11 @@ class Entity:
 
     def add_tag(self, tag: str) -> None:
         """ Add a tag to this entity. """
+        if tag in self._tags:
+            return
         self._tags.add(tag)
+        if self.scene:
+            self.scene.entities.on_tag_added(self, tag)
 
     def initialize(self) -> None:
         """ Called after this entity is created.
@@ -139,10 +226,31 @@ class Entity:
         """ Called when this entity collides with another entity. """
         pass
 
+    def save_state(self) -> tuple:
+        """ Get the values that describe this entity's simulation state, in the order of 'STATE_FORMAT'. """
+        return self.x, self.y, self._previous_x, self._previous_y
+
+    def load_state(self, values: Iterator) -> None:
+        """ Restore the simulation state from values that were saved with 'save_state'.
+        Each class takes its own values from the iterator, in the order that they were saved.
+        """
+        x = next(values)
+        y = next(values)
+        if x != self.x or y != self.y:
+            # Set both coordinates before updating the bounds once
+            if self._components is None:
+                self._x = x
+                self._y = y
+            else:
+                self._components.x[self._component_index] = x
+                self._components.y[self._component_index] = y
+            self._bounds_changed()
+
+        self._previous_x = next(values)
+        self._previous_y = next(values)
+
     @classmethod
     def find(cls, entity_name: str) -> Optional[Entity]:
         """ Find an entity in the current scene. """
         engine = Engine.instance()
-        for entity in engine.scene.entities:
-            if entity.name == entity_name:
-                return entity
+        return engine.scene.entities.find(entity_name)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterator, TypeVar, TYPE_CHECKING
+from typing import Iterator, Optional, TypeVar, TYPE_CHECKING
 
+from core.actor import Actor
 from core.entity import Entity
+from core.slot_list import SlotList
 
 if TYPE_CHECKING:
+    from core.entity_profiler import EntityProfiler
     from core.scene import Scene
 
 
@@ -17,46 +20,88 @@ class EntityList:
         self._scene = scene
 
         # List of entities
-        self._entities: list[Entity] = list()
+        # Entities are kept in stable slots, so removal is constant time and iteration order never changes
+        self._entities: SlotList[Entity] = SlotList()
 
         # Lists for add / remove queue
         self._to_add: list[Entity] = list()
         self._to_remove: list[Entity] = list()
 
         # Sets to quickly check list membership
-        self._current: set[Entity] = set()
         self._adding: set[Entity] = set()
         self._removing: set[Entity] = set()
 
+        # Entities grouped by type (including base classes) and by tag
+        self._types: dict[type, SlotList[Entity]] = dict()
+        self._tags: dict[str, SlotList[Entity]] = dict()
+
+        # Entities grouped by name, in the order they were added
+        self._names: dict[str, SlotList[Entity]] = dict()
+
+        # Changes every time entities are added or removed
+        self._version = 0
+
+        # If a profiler is attached, every entity's update, after_update and draw is timed
+        self._profiler: Optional[EntityProfiler] = None
+
     def __len__(self) -> int:
         return len(self._entities)
 
     def __iter__(self) -> Iterator[Entity]:
-        for entity in self._entities:
-            yield entity
+        return iter(self._entities)
+
+    def __contains__(self, entity: Entity) -> bool:
+        return entity in self._entities
 
     @property
     def scene(self) -> Scene:
         """ The scene that this entity list belongs to. """
         return self._scene
 
-    def of_type(self, entity_type: T) -> Iterator[T]:
+    @property
+    def version(self) -> int:
+        """ A number that changes every time entities are added to or removed from the list. """
+        return self._version
+
+    def of_type(self, entity_type: T) -> SlotList[T]:
+        """ Get the entities that are an instance of a type.
+        The returned sequence is kept up to date by the list, and should not be modified.
+        """
         if not issubclass(entity_type, Entity):
             raise RuntimeError(f"{entity_type} is not inherited from {Entity}")
 
-        for entity in self._entities:
-            if isinstance(entity, entity_type):
-                yield entity
+        bucket = self._types.get(entity_type)
+        if bucket is None:
+            bucket = self._types[entity_type] = SlotList()
+        return bucket
+
+    def with_tag(self, tag: str) -> SlotList[Entity]:
+        """ Get the entities that have a tag.
+        The returned sequence is kept up to date by the list, and should not be modified.
+        """
+        bucket = self._tags.get(tag)
+        if bucket is None:
+            bucket = self._tags[tag] = SlotList()
+        return bucket
+
+    def find(self, entity_name: str) -> Optional[Entity]:
+        """ Find an entity by name.
+        If more than one entity has the name, the one that was added first is returned.
+        """
+        named = self._names.get(entity_name)
+        if named:
+            return named.first()
+        return None
 
     def add(self, entity: Entity) -> None:
         """ Add an entity to the list. """
-        if entity not in self._current and entity not in self._adding:
+        if entity not in self._entities and entity not in self._adding:
             self._to_add.append(entity)
             self._adding.add(entity)
 
     def remove(self, entity: Entity) -> None:
         """ Remove an entity from the list. """
-        if entity in self._current and entity not in self._removing:
+        if entity in self._entities and entity not in self._removing:
             self._to_remove.append(entity)
             self._removing.add(entity)
 
@@ -64,17 +109,28 @@ class EntityList:
         """ This handles all of the logic for adding and removing entities from the list.
         The process is deferred until the start of the next frame.
         """
+        if self._to_add or self._to_remove:
+            self._version += 1
+
         # Add queued entities
         for entity in self._to_add:
             self._entities.append(entity)
-            self._current.add(entity)
             entity.scene = self.scene
+            self._index(entity)
+            if isinstance(entity, Actor):
+                if self.scene.components is not None:
+                    self.scene.components.bind(entity)
+                self.scene.spatial_hash.insert(entity)
 
         # Remove queued entities
         for entity in self._to_remove:
             self._entities.remove(entity)
-            self._current.remove(entity)
             entity.scene = None
+            self._unindex(entity)
+            if isinstance(entity, Actor):
+                self.scene.spatial_hash.remove(entity)
+                if self.scene.components is not None:
+                    self.scene.components.unbind(entity)
 
         # Awake and start
         for entity in self._to_add:
@@ -82,6 +138,7 @@ class EntityList:
 
         for entity in self._to_add:
             entity.start()
+            entity.snap_previous_position()
 
         # Clear lists
         self._to_add.clear()
@@ -89,18 +146,96 @@ class EntityList:
         self._to_remove.clear()
         self._removing.clear()
 
+    def on_tag_added(self, entity: Entity, tag: str) -> None:
+        """ Called by an entity in this list when a tag is added to it. """
+        if entity in self._entities:
+            self.with_tag(tag).append(entity)
+
+    def on_entity_renamed(self, entity: Entity, old_name: Optional[str]) -> None:
+        """ Called by an entity in this list when its name changes. """
+        if entity not in self._entities:
+            return
+        self._remove_name(entity, old_name)
+        self._add_name(entity, entity.name)
+
+    def _add_name(self, entity: Entity, name: Optional[str]) -> None:
+        if name is None:
+            return
+        named = self._names.get(name)
+        if named is None:
+            named = self._names[name] = SlotList()
+        named.append(entity)
+
+    def _remove_name(self, entity: Entity, name: Optional[str]) -> None:
+        if name is None:
+            return
+        named = self._names[name]
+        named.remove(entity)
+        if not named:
+            del self._names[name]
+
+    def _index(self, entity: Entity) -> None:
+        """ Add an entity to the type, tag and name lookups. """
+        for entity_type in type(entity).__mro__:
+            if entity_type is object:
+                break
+            self.of_type(entity_type).append(entity)
+
+        for tag in entity.tags:
+            self.with_tag(tag).append(entity)
+
+        self._add_name(entity, entity.name)
+
+    def _unindex(self, entity: Entity) -> None:
+        """ Remove an entity from the type, tag and name lookups. """
+        for entity_type in type(entity).__mro__:
+            if entity_type is object:
+                break
+            self._types[entity_type].remove(entity)
+
+        for tag in entity.tags:
+            self._tags[tag].remove(entity)
+
+        self._remove_name(entity, entity.name)
+
+    @property
+    def profiler(self) -> Optional[EntityProfiler]:
+        """ The profiler that times each entity, or None if profiling is off. """
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, value: Optional[EntityProfiler]) -> None:
+        self._profiler = value
+
     def update(self) -> None:
         """ Update loop. """
         self.update_list()
+
+        # Remember where each entity was at the start of the step, for interpolated rendering
+        for entity in self._entities:
+            entity.snap_previous_position()
+
+        if self._profiler is not None:
+            self._profiler.run(self._entities, "update")
+            return
+
         for entity in self._entities:
             entity.update()
 
     def after_update(self) -> None:
         """ Called immediately after update. """
+        if self._profiler is not None:
+            self._profiler.run(self._entities, "after_update")
+            return
+
         for entity in self._entities:
             entity.after_update()
 
     def draw(self) -> None:
         """ Draw loop. """
+        if self._profiler is not None:
+            self._profiler.run(self._entities, "draw")
+            return
+
         for entity in self._entities:
             entity.draw()
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from collections import deque
+from time import perf_counter
+from typing import Callable, Iterable, NamedTuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from core.entity import Entity
+
+
+# Frames that take longer than this are flagged (in seconds)
+DEFAULT_BUDGET = 1 / 60
+
+
+class EntityTiming:
+    """ Accumulated time that a group of entities spent in one phase. """
+    __slots__ = ("total", "calls", "max")
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.calls = 0
+        self.max = 0.0
+
+    @property
+    def average(self) -> float:
+        """ The average time per call (in seconds). """
+        return self.total / self.calls if self.calls else 0.0
+
+    def add(self, duration: float) -> None:
+        self.total += duration
+        self.calls += 1
+        if duration > self.max:
+            self.max = duration
+
+
+class Offender(NamedTuple):
+    """ An entity that used a large share of a slow frame. """
+    entity_type: str
+    entity_name: Optional[str]
+    phase: str
+    duration: float
+
+
+class SlowFrame(NamedTuple):
+    """ A frame that went over budget, and the entities that took the most time in it. """
+    frame: int
+    duration: float
+    offenders: list[Offender]
+
+
+class EntityProfiler:
+    """ Times every entity's update, after_update and draw, while it is attached to an entity list.
+    Timings are grouped by entity class and by entity name. A frame starts with each update phase; if the entities
+    took longer than the budget in total, the frame is kept along with its slowest entities.
+    """
+    def __init__(
+            self,
+            budget: float = DEFAULT_BUDGET,
+            offender_count: int = 5,
+            slow_frame_count: int = 100,
+            on_slow_frame: Optional[Callable[[SlowFrame], None]] = None
+    ) -> None:
+        self.budget = budget
+        self.offender_count = offender_count
+        self.on_slow_frame = on_slow_frame
+
+        # Totals for each (class name, phase) and (entity name, phase)
+        self._by_type: dict[tuple[str, str], EntityTiming] = dict()
+        self._by_name: dict[tuple[str, str], EntityTiming] = dict()
+
+        # Timings for the frame in progress
+        self._frame = 0
+        self._frame_timings: list[tuple[Entity, str, float]] = list()
+        self._frame_duration = 0.0
+
+        # The most recent frames that went over budget
+        self._slow_frames: deque[SlowFrame] = deque(maxlen=slow_frame_count)
+
+    @property
+    def frame(self) -> int:
+        """ The number of frames that have been profiled. """
+        return self._frame
+
+    @property
+    def slow_frames(self) -> list[SlowFrame]:
+        """ The most recent frames that went over budget, oldest first. """
+        return list(self._slow_frames)
+
+    def by_type(self) -> dict[tuple[str, str], EntityTiming]:
+        """ Timings grouped by entity class name and phase. """
+        return dict(self._by_type)
+
+    def by_name(self) -> dict[tuple[str, str], EntityTiming]:
+        """ Timings grouped by entity name and phase. Entities without a name are not included. """
+        return dict(self._by_name)
+
+    def run(self, entities: Iterable[Entity], phase: str) -> None:
+        """ Call a phase method on each entity, and time each call. """
+        if phase == "update":
+            self.end_frame()
+
+        timings = self._frame_timings
+        for entity in entities:
+            method = getattr(entity, phase)
+            start = perf_counter()
+            method()
+            timings.append((entity, phase, perf_counter() - start))
+
+    def end_frame(self) -> None:
+        """ Add the timings for the current frame to the totals, and check the frame against the budget. """
+        timings = self._frame_timings
+        if not timings:
+            return
+
+        frame_duration = 0.0
+        for entity, phase, duration in timings:
+            frame_duration += duration
+
+            key = (type(entity).__name__, phase)
+            timing = self._by_type.get(key)
+            if timing is None:
+                timing = self._by_type[key] = EntityTiming()
+            timing.add(duration)
+
+            if entity.name is not None:
+                key = (entity.name, phase)
+                timing = self._by_name.get(key)
+                if timing is None:
+                    timing = self._by_name[key] = EntityTiming()
+                timing.add(duration)
+
+        if frame_duration > self.budget:
+            slowest = sorted(timings, key=lambda timing: timing[2], reverse=True)[:self.offender_count]
+            offenders = [
+                Offender(type(entity).__name__, entity.name, phase, duration)
+                for entity, phase, duration in slowest
+            ]
+            slow_frame = SlowFrame(self._frame, frame_duration, offenders)
+            self._slow_frames.append(slow_frame)
+            if self.on_slow_frame:
+                self.on_slow_frame(slow_frame)
+
+        self._frame += 1
+        timings.clear()
+
+    def clear(self) -> None:
+        """ Remove every timing. """
+        self._by_type.clear()
+        self._by_name.clear()
+        self._frame_timings.clear()
+        self._slow_frames.clear()
+        self._frame = 0
+
+    def report(self, limit: int = 10) -> str:
+        """ Get a table of the groups that took the most time in total (in milliseconds). """
+        lines = list()
+        for title, groups in (("Class", self._by_type), ("Name", self._by_name)):
+            lines.append(f"{title:<24}{'phase':<14}{'calls':>8}{'total':>10}{'avg':>8}{'max':>8}")
+            ranked = sorted(groups.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+            for (group, phase), timing in ranked:
+                lines.append(
+                    f"{group:<24}{phase:<14}{timing.calls:>8}"
+                    f"{timing.total * 1000:10.2f}{timing.average * 1000:8.3f}{timing.max * 1000:8.3f}"
+                )
+            lines.append("")
+
+        lines.append(f"{len(self._slow_frames)} frames over the {self.budget * 1000:.2f} ms budget")
+        for slow_frame in self._slow_frames:
+            offenders = ", ".join(
+                f"{offender.entity_type}({offender.entity_name}).{offender.phase} {offender.duration * 1000:.2f} ms"
+                for offender in slow_frame.offenders
+            )
+            lines.append(f"  frame {slow_frame.frame}: {slow_frame.duration * 1000:.2f} ms - {offenders}")
+        return "\n".join(lines)
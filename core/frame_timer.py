@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Iterable, NamedTuple, Optional
+
+
+# The phases of a frame that the engine times
+PHASE_EVENTS = "events"
+PHASE_UPDATE = "update"
+PHASE_AFTER_UPDATE = "after_update"
+PHASE_DRAW = "draw"
+PHASE_PRESENT = "present"
+PHASE_WAIT = "wait"
+PHASES = (PHASE_EVENTS, PHASE_UPDATE, PHASE_AFTER_UPDATE, PHASE_DRAW, PHASE_PRESENT, PHASE_WAIT)
+
+
+class PhaseStats(NamedTuple):
+    """ Summary of the timings for one phase (in seconds). """
+    count: int
+    min: float
+    avg: float
+    p95: float
+    p99: float
+    max: float
+
+
+class FrameTimer:
+    """ Keeps the most recent timings for each phase of a frame, in fixed-size ring buffers.
+    Recording a timing doesn't allocate, so the timer can stay on all the time.
+    """
+    def __init__(self, capacity: int = 600, phases: Iterable[str] = PHASES) -> None:
+        self._capacity = capacity
+
+        # A ring buffer of durations for each phase, the index that the next sample goes in, and the sample count
+        self._samples: dict[str, array] = {phase: array("d", bytes(8 * capacity)) for phase in phases}
+        self._next: dict[str, int] = {phase: 0 for phase in self._samples}
+        self._count: dict[str, int] = {phase: 0 for phase in self._samples}
+
+    @property
+    def capacity(self) -> int:
+        """ The number of samples that are kept for each phase. """
+        return self._capacity
+
+    @property
+    def phases(self) -> tuple[str, ...]:
+        """ The names of the phases that are timed. """
+        return tuple(self._samples)
+
+    def record(self, phase: str, duration: float) -> None:
+        """ Add a timing for a phase (in seconds). """
+        index = self._next[phase]
+        self._samples[phase][index] = duration
+        self._next[phase] = (index + 1) % self._capacity
+        if self._count[phase] < self._capacity:
+            self._count[phase] += 1
+
+    def samples(self, phase: str, window: Optional[int] = None) -> list[float]:
+        """ Get the most recent timings for a phase, oldest first.
+        If 'window' is given, only that many samples are returned.
+        """
+        count = self._count[phase]
+        if window is not None:
+            count = min(count, window)
+
+        samples = self._samples[phase]
+        end = self._next[phase]
+        start = end - count
+        if start >= 0:
+            return samples[start:end].tolist()
+        return samples[start:].tolist() + samples[:end].tolist()
+
+    def stats(self, phase: str, window: Optional[int] = None) -> Optional[PhaseStats]:
+        """ Get the min, average, 95th and 99th percentile, and max timing for a phase.
+        Returns None if the phase hasn't been timed yet.
+        """
+        samples = self.samples(phase, window)
+        if not samples:
+            return None
+
+        samples.sort()
+        return PhaseStats(
+            count=len(samples),
+            min=samples[0],
+            avg=sum(samples) / len(samples),
+            p95=percentile(samples, 95),
+            p99=percentile(samples, 99),
+            max=samples[-1]
+        )
+
+    def clear(self) -> None:
+        """ Remove every timing. """
+        for phase in self._samples:
+            self._next[phase] = 0
+            self._count[phase] = 0
+
+    def report(self, window: Optional[int] = None) -> str:
+        """ Get a table of the stats for every phase (in milliseconds). """
+        lines = [f"{'phase':<14}{'min':>8}{'avg':>8}{'p95':>8}{'p99':>8}{'max':>8}"]
+        for phase in self._samples:
+            stats = self.stats(phase, window)
+            if stats is None:
+                continue
+            values = "".join(f"{value * 1000:8.3f}" for value in stats[1:])
+            lines.append(f"{phase:<14}{values}")
+        return "\n".join(lines)
+
+
+def percentile(sorted_samples: list[float], percent: float) -> float:
+    """ Get a percentile of some sorted samples, using the nearest-rank method. """
+    rank = math.ceil(percent / 100 * len(sorted_samples))
+    return sorted_samples[max(rank, 1) - 1]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import random
+
+
+class GameRandom(random.Random):
+    """ A random number generator that counts the changes to its state.
+    Copying the whole generator state is slow, so snapshots use the count to skip it when nothing was drawn.
+    Every draw goes through 'random' or 'getrandbits', so the numbers are the same as from random.Random.
+    """
+    def __init__(self, seed: object = None) -> None:
+        self.changes = 0
+        super().__init__(seed)
+
+    def seed(self, *args, **kwargs) -> None:
+        self.changes += 1
+        super().seed(*args, **kwargs)
+
+    def setstate(self, state: tuple) -> None:
+        self.changes += 1
+        super().setstate(state)
+
+    def random(self) -> float:
+        self.changes += 1
+        return super().random()
+
+    def getrandbits(self, k: int) -> int:
+        self.changes += 1
+        return super().getrandbits(k)
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        # This can use a cached value without drawing a new one
+        self.changes += 1
+        return super().gauss(mu, sigma)
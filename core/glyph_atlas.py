@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import ctypes
+import string
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+import sdl2
+import sdl2.sdlttf
+
+if TYPE_CHECKING:
+    import sdl2.ext
+
+
+# Glyphs that are rasterized up front. Anything else is added the first time it's used.
+DEFAULT_CHARACTERS = string.digits + string.ascii_letters + string.punctuation + " "
+
+# Width of an atlas page. Glyphs are placed left to right in rows.
+PAGE_WIDTH = 512
+
+
+class GlyphAtlas:
+    """ Rasterizes each glyph of a font once, onto a single texture.
+    Glyphs are rendered in white, so text can be drawn in any color by modulating the vertex color.
+    """
+    def __init__(
+            self,
+            font_file: Path | ctypes.Array | bytes,
+            size: int,
+            renderer: Optional[sdl2.ext.Renderer],
+            characters: str = DEFAULT_CHARACTERS
+    ) -> None:
+        if not sdl2.sdlttf.TTF_WasInit():
+            if sdl2.sdlttf.TTF_Init() != 0:
+                raise _ttf_error()
+
+        # The font can be opened from a file, or from font data that is already in memory.
+        # The font reads from its data for as long as it's open, so the data is kept with it.
+        self._font_data = None
+        if isinstance(font_file, Path):
+            self._font = sdl2.sdlttf.TTF_OpenFont(font_file.as_posix().encode("utf-8"), size)
+        else:
+            self._font_data = font_file
+            stream = sdl2.SDL_RWFromConstMem(font_file, len(font_file))
+            self._font = sdl2.sdlttf.TTF_OpenFontRW(stream, 1, size)
+        if not self._font:
+            raise _ttf_error()
+
+        # If there is no renderer, only the glyph metrics are loaded
+        self._renderer = renderer
+
+        # The line height of the font
+        self._height = sdl2.sdlttf.TTF_FontHeight(self._font)
+
+        # The source rectangle and advance for each glyph
+        self._glyphs: dict[str, tuple[tuple[int, int, int, int], int]] = dict()
+        self._texture: Optional[sdl2.ext.Texture] = None
+        self._build(characters)
+
+    @property
+    def height(self) -> int:
+        """ The line height of the font. """
+        return self._height
+
+    @property
+    def texture(self) -> Optional[sdl2.ext.Texture]:
+        """ The texture that holds every glyph. """
+        return self._texture
+
+    def glyph(self, character: str) -> tuple[tuple[int, int, int, int], int]:
+        """ Get the source rectangle and advance for a glyph. """
+        return self._glyphs[character]
+
+    def prepare(self, text: str) -> None:
+        """ Make sure every glyph in a string is in the atlas. """
+        glyphs = self._glyphs
+        for character in text:
+            if character not in glyphs:
+                self._build("".join(glyphs) + "".join(c for c in set(text) if c not in glyphs))
+                return
+
+    def measure(self, text: str) -> int:
+        """ Get the width of a string. """
+        self.prepare(text)
+        glyphs = self._glyphs
+        return sum(glyphs[character][1] for character in text)
+
+    def destroy(self) -> None:
+        """ Release the font and the texture. """
+        if self._texture:
+            self._texture.destroy()
+            self._texture = None
+        if self._font:
+            sdl2.sdlttf.TTF_CloseFont(self._font)
+            self._font = None
+
+    def _build(self, characters: str) -> None:
+        """ Rasterize glyphs, and pack them into the atlas texture. """
+        white = sdl2.SDL_Color(255, 255, 255, 255)
+        advance = ctypes.c_int()
+        unused = ctypes.c_int()
+
+        # Measure and render each glyph
+        rendered = list()
+        for character in characters:
+            code = ord(character)
+            sdl2.sdlttf.TTF_GlyphMetrics32(self._font, code, unused, unused, unused, unused, advance)
+
+            surface = None
+            if self._renderer:
+                surface = sdl2.sdlttf.TTF_RenderGlyph32_Blended(self._font, code, white)
+            rendered.append((character, advance.value, surface))
+
+        # Place glyphs in rows
+        x = y = row_height = 0
+        placements = list()
+        for character, glyph_advance, surface in rendered:
+            width, height = (surface.contents.w, surface.contents.h) if surface else (0, 0)
+            if x + width > PAGE_WIDTH:
+                x = 0
+                y += row_height + 1
+                row_height = 0
+            placements.append((character, glyph_advance, surface, x, y, width, height))
+            x += width + 1
+            row_height = max(row_height, height)
+        page_height = max(y + row_height, 1)
+
+        self._glyphs.clear()
+        for character, glyph_advance, surface, x, y, width, height in placements:
+            self._glyphs[character] = ((x, y, width, height), glyph_advance)
+
+        if not self._renderer:
+            return
+
+        # Copy the glyphs onto one surface, and upload it
+        page = sdl2.SDL_CreateRGBSurfaceWithFormat(0, PAGE_WIDTH, page_height, 32, sdl2.SDL_PIXELFORMAT_RGBA32)
+        for character, glyph_advance, surface, x, y, width, height in placements:
+            if surface:
+                sdl2.SDL_SetSurfaceBlendMode(surface, sdl2.SDL_BLENDMODE_NONE)
+                sdl2.SDL_BlitSurface(surface, None, page, sdl2.SDL_Rect(x, y, width, height))
+                sdl2.SDL_FreeSurface(surface)
+
+        from sdl2.ext import Texture
+        if self._texture:
+            self._texture.destroy()
+        self._texture = Texture(self._renderer, page.contents)
+        sdl2.SDL_FreeSurface(page)
+
+
+def _ttf_error() -> Exception:
+    """ Create an error from the last SDL_ttf error message. """
+    import sdl2.ext
+    return sdl2.ext.SDLError(sdl2.sdlttf.TTF_GetError())
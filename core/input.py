@@ -1,5 +1,6 @@
+from typing import Iterable
+
 import sdl2
-import sdl2.ext
 import sdl2.keyboard
 
 
@@ -21,3 +22,13 @@ class Input:
     def get_key(cls, key: int) -> bool:
         """ Check if a key is pressed. """
         return key in cls.__keys
+
+    @classmethod
+    def keys(cls) -> frozenset[int]:
+        """ Get the keys that are pressed. """
+        return frozenset(cls.__keys)
+
+    @classmethod
+    def set_keys(cls, keys: Iterable[int]) -> None:
+        """ Replace the pressed keys. This is used to play back recorded input. """
+        cls.__keys = set(keys)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+class NullTexture:
+    """ A stand-in for an sdl2.ext.Texture when running without a renderer.
+    It only keeps track of the size of the image.
+    """
+    def __init__(self, width: int, height: int) -> None:
+        self._size = (width, height)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """ The width and height of the texture. """
+        return self._size
+
+    def destroy(self) -> None:
+        pass
+
+
+class NullRenderer:
+    """ A renderer that doesn't draw anything.
+    This is used by the engine when it runs headless.
+    """
+    def __init__(self, logical_size: tuple[int, int] = (0, 0)) -> None:
+        self.logical_size = logical_size
+
+    @property
+    def sdlrenderer(self) -> None:
+        """ There is no SDL rendering context behind a null renderer. """
+        return None
+
+    def clear(self, color: Optional[object] = None) -> None:
+        pass
+
+    def copy(self, *args, **kwargs) -> None:
+        pass
+
+    def present(self) -> None:
+        pass
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+
+def decode_image(image_file: Path):
+    """ Decode an image file to RGBA pixels.
+    This runs on a worker thread. PIL releases the GIL while it decodes, so workers can run in parallel.
+    """
+    from PIL import Image
+    with Image.open(image_file) as image:
+        return image.convert("RGBA")
+
+
+def read_file(content_file: Path) -> bytes:
+    """ Read a file into memory. This runs on a worker thread. """
+    return content_file.read_bytes()
+
+
+class PreloadRequest:
+    """ Tracks the progress of a call to 'Content.preload'.
+    Files are decoded on worker threads, then handed to the main thread to be uploaded by 'Content.process_preloads'.
+    """
+    def __init__(self, content_paths: Iterable[str]) -> None:
+        self._content_paths = tuple(content_paths)
+        self._remaining = set(self._content_paths)
+
+    @property
+    def content_paths(self) -> tuple[str, ...]:
+        """ The content that was requested. """
+        return self._content_paths
+
+    @property
+    def done(self) -> bool:
+        """ True once every file has been decoded and uploaded. """
+        return not self._remaining
+
+    @property
+    def progress(self) -> float:
+        """ The fraction of files that are ready, from 0 to 1. """
+        if not self._content_paths:
+            return 1.0
+        return 1.0 - len(self._remaining) / len(self._content_paths)
+
+    def complete(self, content_path: str) -> None:
+        """ Mark a file as ready. """
+        self._remaining.discard(content_path)
@@ -0,0 +1,186 @@
+""" Recording and replaying the input of a run.
+The engine's random number generator is seeded at the start of a recording, and the keys that were pressed during each
+fixed step are saved with the seed. Feeding the same keys back through the fixed-step loop reproduces the run exactly,
+so a replay can run headless, as fast as the CPU allows.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+from pathlib import Path
+from typing import NamedTuple, Optional, TYPE_CHECKING
+
+from core.engine import Engine, TIMESTEP
+from core.input import Input
+
+if TYPE_CHECKING:
+    from core.scene import Scene
+
+
+RECORDING_VERSION = 1
+
+
+def state_hash(scene: Optional[Scene]) -> str:
+    """ Hash the simulation state of a scene. """
+    state = scene.save_state() if scene else b""
+    return hashlib.blake2b(state, digest_size=8).hexdigest()
+
+
+def scene_path(scene: Scene) -> str:
+    """ Get the import path of a scene's class. """
+    return f"{type(scene).__module__}.{type(scene).__qualname__}"
+
+
+def create_scene(path: str) -> Scene:
+    """ Create a scene from the import path of its class. """
+    module_name, _, class_name = path.rpartition(".")
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+
+class InputRecording:
+    """ The seed, and the keys that were pressed during each step of a run.
+    If state hashes were recorded, there is one for the end of each step.
+    """
+    def __init__(
+            self,
+            seed: int,
+            scene: Optional[str] = None,
+            steps: Optional[list[frozenset[int]]] = None,
+            hashes: Optional[list[str]] = None
+    ) -> None:
+        self.seed = seed
+        self.scene = scene
+        self.steps: list[frozenset[int]] = steps if steps is not None else list()
+        self.hashes: list[str] = hashes if hashes is not None else list()
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def save(self, file_path: Path) -> None:
+        """ Save the recording as JSON.
+        The keys rarely change between steps, so they are stored as runs of identical steps.
+        """
+        runs = list()
+        for keys in self.steps:
+            if runs and runs[-1][1] == keys:
+                runs[-1][0] += 1
+            else:
+                runs.append([1, keys])
+
+        data = {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "timestep": TIMESTEP,
+            "scene": self.scene,
+            "keys": [[count, sorted(keys)] for count, keys in runs],
+            "hashes": self.hashes
+        }
+        file_path.write_text(json.dumps(data, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, file_path: Path) -> InputRecording:
+        """ Load a recording that was saved as JSON. """
+        data = json.loads(file_path.read_text())
+        if data.get("version") != RECORDING_VERSION:
+            raise ValueError(f"{file_path} is not a version {RECORDING_VERSION} recording")
+        if data["timestep"] != TIMESTEP:
+            raise ValueError(f"{file_path} was recorded with a different time step")
+
+        steps = list()
+        for count, keys in data["keys"]:
+            steps.extend([frozenset(keys)] * count)
+        return cls(data["seed"], data["scene"], steps, data["hashes"])
+
+
+class InputRecorder:
+    """ Records the keys that are pressed during each step of the engine, and optionally a hash of the state each step
+    ends in. Recording has to start before the first scene is loaded, so that a replay starts from the same state.
+    """
+    def __init__(self, hash_states: bool = True) -> None:
+        self.hash_states = hash_states
+        self._recording: Optional[InputRecording] = None
+
+    @property
+    def recording(self) -> Optional[InputRecording]:
+        """ The recording, or None if recording hasn't started. """
+        return self._recording
+
+    def start(self, engine: Engine, seed: Optional[int] = None) -> InputRecording:
+        """ Reseed the engine and start recording its steps. """
+        if engine.scene is not None:
+            raise RuntimeError("Recording has to start before the first scene is loaded")
+
+        self._recording = InputRecording(engine.reseed(seed))
+        engine.input_recorder = self
+        return self._recording
+
+    def stop(self, engine: Engine) -> Optional[InputRecording]:
+        """ Stop recording. Returns the recording. """
+        if engine.input_recorder is self:
+            engine.input_recorder = None
+        return self._recording
+
+    def record_input(self, keys: frozenset[int]) -> None:
+        """ Called by the engine before each step updates the scene. """
+        self._recording.steps.append(keys)
+
+    def record_state(self, scene: Optional[Scene]) -> None:
+        """ Called by the engine at the end of each step. """
+        recording = self._recording
+        if recording.scene is None and scene is not None:
+            recording.scene = scene_path(scene)
+        if self.hash_states:
+            recording.hashes.append(state_hash(scene))
+
+
+class ReplayResult(NamedTuple):
+    """ The outcome of a replay.
+    If the replay diverged, 'diverged_at' is the first step whose state hash didn't match the recording.
+    """
+    steps: int
+    diverged_at: Optional[int]
+    expected_hash: Optional[str]
+    actual_hash: Optional[str]
+
+    @property
+    def diverged(self) -> bool:
+        """ True if the replay didn't match the recording. """
+        return self.diverged_at is not None
+
+
+def replay(
+        recording: InputRecording,
+        first_scene: Optional[Scene] = None,
+        stop_on_divergence: bool = True
+) -> ReplayResult:
+    """ Feed a recording back through the fixed-step loop, headless and as fast as possible.
+    If no scene is given, the scene that the recording started in is created.
+    The state hash of each step is checked against the recording, if it has hashes.
+    """
+    if first_scene is None:
+        first_scene = create_scene(recording.scene)
+
+    engine = Engine()
+    engine.reseed(recording.seed)
+    engine.scene = first_scene
+
+    hashes = recording.hashes
+    steps = 0
+    diverged_at = expected_hash = actual_hash = None
+    for index, keys in enumerate(recording.steps):
+        Input.set_keys(keys)
+        engine.step()
+        steps += 1
+
+        # Compare the state to the recording, until the first difference
+        if diverged_at is None and index < len(hashes):
+            state = state_hash(engine.scene)
+            if state != hashes[index]:
+                diverged_at, expected_hash, actual_hash = index, hashes[index], state
+                if stop_on_divergence:
+                    break
+
+    Input.set_keys(())
+    return ReplayResult(steps, diverged_at, expected_hash, actual_hash)
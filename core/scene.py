@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from typing import Iterator, Optional, TypeVar, TYPE_CHECKING
+from typing import Optional, TypeVar, TYPE_CHECKING
 
 from core.entity_list import EntityList
 from core.actor import Actor
+from core.content import Content
+from core.snapshot import StateLayout
+from core.slot_list import SlotList
+from core.spatial_hash import SpatialHash
 
 if TYPE_CHECKING:
+    from core.component_store import ComponentStore
+    from core.datatypes.rect import Rect
     from core.engine import Engine
 
 
@@ -16,6 +22,9 @@ class Scene:
     def __init__(self) -> None:
         self._engine = None
         self._entities = EntityList(self)
+        self._spatial_hash = SpatialHash()
+        self._components = None
+        self._state_layout: Optional[StateLayout] = None
 
     @property
     def engine(self) -> Optional[Engine]:
@@ -30,9 +39,46 @@ class Scene:
         return self._entities
 
     @property
-    def actors(self) -> Iterator[Actor]:
-        for entity in self.entities.of_type(Actor):
-            yield entity
+    def spatial_hash(self) -> SpatialHash:
+        """ The broadphase that is used for collision checks between actors. """
+        return self._spatial_hash
+
+    @property
+    def components(self) -> Optional[ComponentStore]:
+        """ The component store for the actors in this scene, if it's enabled. """
+        return self._components
+
+    def enable_component_store(self, bounds: Optional[Rect] = None) -> ComponentStore:
+        """ Store actor components in contiguous arrays, and move actors with a single vectorized pass per step.
+        This must be called before entities are added to the scene. It requires numpy.
+        """
+        from core.component_store import ComponentStore
+        if self._components is None:
+            self._components = ComponentStore(bounds, self._spatial_hash)
+        return self._components
+
+    @property
+    def actors(self) -> SlotList[Actor]:
+        """ The actors that belong to this scene. """
+        return self.entities.of_type(Actor)
+
+    def save_state(self) -> bytes:
+        """ Capture the simulation state of the scene in a compact binary snapshot.
+        This includes the time, the engine's random number generator, and the saved state of every entity.
+        """
+        return self._get_state_layout().save()
+
+    def load_state(self, snapshot: bytes) -> None:
+        """ Restore a snapshot in place.
+        The scene must have the same entities as when the snapshot was saved.
+        """
+        self._get_state_layout().load(snapshot)
+
+    def _get_state_layout(self) -> StateLayout:
+        """ Get the snapshot layout for the current entities. """
+        if self._state_layout is None or not self._state_layout.matches(self):
+            self._state_layout = StateLayout(self)
+        return self._state_layout
 
     def load_entities(self) -> None:
         """ Load entities into the scene. This is called right before 'start'. """
@@ -44,7 +90,15 @@ class Scene:
 
     def update(self) -> None:
         """ Update loop. """
+        # Upload any content that finished loading in the background
+        Content.process_preloads()
+
         self.entities.update()
+        if self._components is not None:
+            self._components.step()
+
+    def after_update(self) -> None:
+        """ Called after every entity has been updated. """
         self.entities.after_update()
 
     def draw(self) -> None:
@@ -52,5 +106,8 @@ class Scene:
         self.entities.draw()
 
     def end(self) -> None:
-        """ Called before the engine loads the next scene. """
+        """ Called before the engine loads the next scene.
+        Content that was loaded for this scene is released.
+        """
         self._engine = None
+        Content.release_scope(self)
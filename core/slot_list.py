@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Generic, Iterator, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+
+class SlotList(Generic[T]):
+    """ An ordered collection with constant time removal.
+    Each item is stored in a slot. Removing an item empties its slot instead of shifting the items after it,
+    so iteration order stays the same as insertion order.
+    Empty slots are compacted once they make up half of the list.
+    """
+    def __init__(self) -> None:
+        # Items in insertion order - removed items leave a None in their slot
+        self._slots: list[Optional[T]] = list()
+
+        # The slot index of each item
+        self._indices: dict[T, int] = dict()
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __bool__(self) -> bool:
+        return bool(self._indices)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._indices
+
+    def __iter__(self) -> Iterator[T]:
+        if len(self._slots) == len(self._indices):
+            return iter(self._slots)
+        return (item for item in self._slots if item is not None)
+
+    def __repr__(self) -> str:
+        return f"SlotList({list(self)})"
+
+    def append(self, item: T) -> None:
+        """ Add an item to the end of the list. """
+        if item in self._indices:
+            return
+        self._indices[item] = len(self._slots)
+        self._slots.append(item)
+
+    def remove(self, item: T) -> None:
+        """ Remove an item from the list. """
+        index = self._indices.pop(item)
+        self._slots[index] = None
+
+        # Compact the list when it is mostly empty slots
+        if len(self._indices) * 2 < len(self._slots):
+            self._compact()
+
+    def first(self) -> Optional[T]:
+        """ Return the first item in the list, or None if the list is empty. """
+        for item in self:
+            return item
+        return None
+
+    def clear(self) -> None:
+        """ Remove all items from the list. """
+        self._slots.clear()
+        self._indices.clear()
+
+    def _compact(self) -> None:
+        """ Remove empty slots. """
+        self._slots = [item for item in self._slots if item is not None]
+        for index, item in enumerate(self._slots):
+            self._indices[item] = index
@@ -0,0 +1,127 @@
+""" Snapshots of a scene's simulation state.
+A snapshot is a compact binary buffer with the time, the engine's random number generator, and the saved state of
+every entity in the scene. Restoring a snapshot sets the values on the existing entities, without rebuilding them.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Optional, TYPE_CHECKING
+
+from core.engine import Engine
+from core.time import Time
+
+if TYPE_CHECKING:
+    from core.scene import Scene
+
+
+# Time.delta_time and time_scale.
+# The real delta time and the interpolation alpha come from the wall clock, not the simulation, so they are left out.
+TIME_STRUCT = struct.Struct("<dd")
+
+# The Mersenne Twister state (624 words and a position), and the cached value for random.gauss
+RANDOM_VERSION = 3
+RANDOM_STRUCT = struct.Struct("<625I?d")
+
+RANDOM_START = TIME_STRUCT.size
+ENTITIES_START = RANDOM_START + RANDOM_STRUCT.size
+
+
+class StateLayout:
+    """ The binary layout of a scene's state, for one set of entities.
+    The generator state is most of a snapshot, but it only changes when a random number is drawn.
+    It is packed once and reused until then, so saving and restoring take a few microseconds.
+    """
+    def __init__(self, scene: Scene) -> None:
+        self._version = scene.entities.version
+        self._entities = tuple(scene.entities)
+        self._struct = struct.Struct("<" + "".join(type(entity).STATE_FORMAT for entity in self._entities))
+
+        # The packed generator state, and the change count of the generator when it had that state
+        self._random_state = b""
+        self._random_changes = -1
+
+    @property
+    def size(self) -> int:
+        """ The size of a snapshot (in bytes). """
+        return ENTITIES_START + self._struct.size
+
+    def matches(self, scene: Scene) -> bool:
+        """ Check if this layout is still valid for a scene's entities. """
+        return self._version == scene.entities.version
+
+    def save(self) -> bytes:
+        """ Pack the current state into a snapshot. """
+        time_state = TIME_STRUCT.pack(Time.delta_time, Time.time_scale)
+
+        rng = Engine.instance().random
+        if rng.changes != self._random_changes:
+            _, internal_state, gauss_next = rng.getstate()
+            self._random_state = RANDOM_STRUCT.pack(*internal_state, gauss_next is not None, gauss_next or 0.0)
+            self._random_changes = rng.changes
+
+        values = list()
+        for entity in self._entities:
+            values.extend(entity.save_state())
+        return time_state + self._random_state + self._struct.pack(*values)
+
+    def load(self, snapshot: bytes) -> None:
+        """ Restore the state from a snapshot. """
+        if len(snapshot) != self.size:
+            raise ValueError("The snapshot was saved with a different set of entities")
+
+        Time.delta_time, Time.time_scale = TIME_STRUCT.unpack_from(snapshot)
+
+        # Only restore the generator if its state is different
+        rng = Engine.instance().random
+        random_state = snapshot[RANDOM_START:ENTITIES_START]
+        if rng.changes != self._random_changes or random_state != self._random_state:
+            values = RANDOM_STRUCT.unpack(random_state)
+            rng.setstate((RANDOM_VERSION, values[:625], values[626] if values[625] else None))
+            self._random_state = random_state
+            self._random_changes = rng.changes
+
+        entity_values = iter(self._struct.unpack_from(snapshot, ENTITIES_START))
+        for entity in self._entities:
+            entity.load_state(entity_values)
+
+
+class SnapshotRing:
+    """ Keeps the most recent snapshots of a scene in a fixed-size ring, for rewinding. """
+    def __init__(self, capacity: int = 600) -> None:
+        self._capacity = capacity
+        self._snapshots: list[Optional[bytes]] = [None] * capacity
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """ The number of snapshots that are kept. """
+        return self._capacity
+
+    def push(self, scene: Scene) -> None:
+        """ Save a snapshot of a scene. If the ring is full, the oldest snapshot is replaced. """
+        self._snapshots[self._next] = scene.save_state()
+        self._next = (self._next + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def get(self, steps_back: int = 0) -> bytes:
+        """ Get a snapshot. 0 is the most recent one, 1 is the one before it, etc. """
+        if not 0 <= steps_back < self._count:
+            raise IndexError(f"There are only {self._count} snapshots")
+        return self._snapshots[(self._next - 1 - steps_back) % self._capacity]
+
+    def rewind(self, scene: Scene, steps_back: int = 0) -> None:
+        """ Restore a snapshot, and drop every snapshot that is newer than it. """
+        scene.load_state(self.get(steps_back))
+        self._next = (self._next - steps_back) % self._capacity
+        self._count -= steps_back
+
+    def clear(self) -> None:
+        """ Remove every snapshot. """
+        self._snapshots = [None] * self._capacity
+        self._next = 0
+        self._count = 0
@@ -1,5 +1,3 @@
-import sdl2.sdlmixer
-
 from core.content import Content
 from core.engine import Engine
 
@@ -11,4 +9,8 @@ class Sound:
 
     def play(self):
         """ Play the audio. """
+        if not self._audio:
+            return
+
+        import sdl2.sdlmixer
         sdl2.sdlmixer.Mix_PlayChannel(channel=-1, chunk=self._audio, loops=0)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+from core.datatypes.rect import Rect
+
+if TYPE_CHECKING:
+    from core.actor import Actor
+
+
+class SpatialHash:
+    """ A uniform grid that buckets actors by the cells that their bounding boxes overlap.
+    This is used as a broadphase, so collision checks only need to look at nearby actors.
+    """
+    def __init__(self, cell_size: int = 32) -> None:
+        self._cell_size = cell_size
+
+        # Actors in each cell
+        self._cells: dict[tuple[int, int], dict[Actor, None]] = dict()
+
+        # The range of cells that each actor is in - (left, top, right, bottom)
+        self._ranges: dict[Actor, tuple[int, int, int, int]] = dict()
+
+        # The order that actors were inserted, so query results are deterministic
+        self._order: dict[Actor, int] = dict()
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, actor: Actor) -> bool:
+        return actor in self._ranges
+
+    @property
+    def cell_size(self) -> int:
+        """ The width and height of each cell in the grid. """
+        return self._cell_size
+
+    def cell_range(self, rect: Rect) -> tuple[int, int, int, int]:
+        """ Get the range of cells that a rectangle overlaps.
+        The right and bottom edges are exclusive, and they can be fractional.
+        """
+        size = self._cell_size
+        left = int(rect.left // size)
+        top = int(rect.top // size)
+        right = max(left, math.ceil(rect.right / size) - 1)
+        bottom = max(top, math.ceil(rect.bottom / size) - 1)
+        return left, top, right, bottom
+
+    def insert(self, actor: Actor) -> None:
+        """ Add an actor to the grid. """
+        if actor in self._ranges:
+            return
+
+        self._order[actor] = self._counter
+        self._counter += 1
+
+        cell_range = self.cell_range(actor.bbox)
+        self._ranges[actor] = cell_range
+        self._add_to_cells(actor, cell_range)
+
+    def remove(self, actor: Actor) -> None:
+        """ Remove an actor from the grid. """
+        cell_range = self._ranges.pop(actor, None)
+        if cell_range is None:
+            return
+
+        del self._order[actor]
+        self._remove_from_cells(actor, cell_range)
+
+    def update(self, actor: Actor) -> None:
+        """ Update the cells that an actor is in after its bounding box has changed. """
+        old_range = self._ranges.get(actor)
+        if old_range is None:
+            return
+
+        new_range = self.cell_range(actor.bbox)
+        if new_range == old_range:
+            return
+
+        self._remove_from_cells(actor, old_range)
+        self._add_to_cells(actor, new_range)
+        self._ranges[actor] = new_range
+
+    def query(self, rect: Rect) -> list[Actor]:
+        """ Get the actors whose bounding boxes intersect a rectangle.
+        Actors are returned in the order that they were inserted.
+        """
+        left, top, right, bottom = self.cell_range(rect)
+
+        candidates = dict()
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = self._cells.get((cell_x, cell_y))
+                if cell:
+                    candidates.update(cell)
+
+        results = [actor for actor in candidates if rect.intersects(actor.bbox)]
+        if len(results) > 1:
+            results.sort(key=self._order.__getitem__)
+        return results
+
+    def clear(self) -> None:
+        """ Remove all actors from the grid. """
+        self._cells.clear()
+        self._ranges.clear()
+        self._order.clear()
+
+    def _add_to_cells(self, actor: Actor, cell_range: tuple[int, int, int, int]) -> None:
+        left, top, right, bottom = cell_range
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = self._cells.get((cell_x, cell_y))
+                if cell is None:
+                    cell = self._cells[(cell_x, cell_y)] = dict()
+                cell[actor] = None
+
+    def _remove_from_cells(self, actor: Actor, cell_range: tuple[int, int, int, int]) -> None:
+        left, top, right, bottom = cell_range
+        for cell_x in range(left, right + 1):
+            for cell_y in range(top, bottom + 1):
+                cell = self._cells[(cell_x, cell_y)]
+                del cell[actor]
+                if not cell:
+                    del self._cells[(cell_x, cell_y)]
@@ -1,7 +1,3 @@
-import sdl2.ext
-import sdl2.render
-import sdl2.sdlimage
-
 from core.content import Content
 from core.engine import Engine
 from core.datatypes.pivot import Pivot
@@ -11,9 +7,9 @@ from core.datatypes.point import Point
 class Sprite:
     def __init__(self, content_path: str) -> None:
         self._engine = Engine.instance()
-        self._texture = Content.load_texture(content_path)
-        self._width = self._texture.size[0]
-        self._height = self._texture.size[1]
+        self._region = Content.load_region(content_path)
+        self._width = self._region.width
+        self._height = self._region.height
         self._pivot = Pivot()
 
     @property
@@ -33,13 +29,10 @@ class Sprite:
 
     def draw(self, position: Point) -> None:
         """ Draw the sprite at a given position. """
-        pivot_offset = Point(self.pivot.x * self.width, self.pivot.y * self.height)
-        draw_position = position - pivot_offset
-        self._engine.renderer.copy(
-            src=self._texture,
-            srcrect=None,
-            dstrect=draw_position.to_tuple(),
-            angle=0,
-            center=None,
-            flip=sdl2.render.SDL_FLIP_NONE
-        )
+        batch = self._engine.sprite_batch
+        if batch is None:
+            return
+
+        x = position.x - int(self._pivot.x * self._width)
+        y = position.y - int(self._pivot.y * self._height)
+        batch.draw(self._region.texture, self._region.source, (x, y, self._width, self._height))
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import ctypes
+import struct
+from typing import Optional, TYPE_CHECKING
+
+import sdl2
+import sdl2.render
+
+if TYPE_CHECKING:
+    import sdl2.ext
+
+
+# Layout of one SDL_Vertex: position (x, y), color (r, g, b, a), texture coordinate (u, v)
+VERTEX_FORMAT = "ff4Bff"
+QUAD = struct.Struct("<" + VERTEX_FORMAT * 4)
+QUAD_INDICES = (0, 1, 2, 2, 3, 0)
+
+WHITE = (255, 255, 255, 255)
+
+
+class SpriteBatch:
+    """ Collects textured quads and draws them with as few SDL_RenderGeometry calls as possible.
+    Quads are drawn in the order they were added. Consecutive quads that use the same texture are sent in one call,
+    so the number of calls scales with the number of texture changes instead of the number of sprites.
+    """
+    def __init__(self, renderer: sdl2.ext.Renderer, capacity: int = 256) -> None:
+        self._renderer = renderer
+
+        # The texture for the quads that are waiting to be drawn
+        self._texture: Optional[sdl2.ext.Texture] = None
+        self._texture_width = 1
+        self._texture_height = 1
+        self._quad_count = 0
+
+        # Reusable vertex and index buffers
+        self._capacity = 0
+        self._vertices = bytearray()
+        self._indices = (ctypes.c_int * 0)()
+        self._reserve(capacity)
+
+        # Number of SDL_RenderGeometry calls in the current frame
+        self._draw_calls = 0
+
+    @property
+    def draw_calls(self) -> int:
+        """ The number of draw calls that were made since the batch was last reset. """
+        return self._draw_calls
+
+    def reset_stats(self) -> None:
+        """ Reset the draw call counter. """
+        self._draw_calls = 0
+
+    def draw(
+            self,
+            texture: sdl2.ext.Texture,
+            srcrect: Optional[tuple[int, int, int, int]],
+            dstrect: tuple[float, float, float, float],
+            color: tuple[int, int, int, int] = WHITE
+    ) -> None:
+        """ Add a quad to the batch.
+        The source rectangle is in pixels on the texture. If it's None, the whole texture is used.
+        The color is multiplied with the texture.
+        """
+        if texture is not self._texture:
+            self.flush()
+            self._texture = texture
+            self._texture_width, self._texture_height = texture.size
+
+        if self._quad_count == self._capacity:
+            self._reserve(self._capacity * 2)
+
+        # Texture coordinates
+        if srcrect is None:
+            u0, v0, u1, v1 = 0.0, 0.0, 1.0, 1.0
+        else:
+            sx, sy, sw, sh = srcrect
+            u0 = sx / self._texture_width
+            v0 = sy / self._texture_height
+            u1 = (sx + sw) / self._texture_width
+            v1 = (sy + sh) / self._texture_height
+
+        # Screen coordinates
+        x0, y0, w, h = dstrect
+        x1 = x0 + w
+        y1 = y0 + h
+
+        r, g, b, a = color
+        QUAD.pack_into(
+            self._vertices, self._quad_count * QUAD.size,
+            x0, y0, r, g, b, a, u0, v0,
+            x1, y0, r, g, b, a, u1, v0,
+            x1, y1, r, g, b, a, u1, v1,
+            x0, y1, r, g, b, a, u0, v1
+        )
+        self._quad_count += 1
+
+    def flush(self) -> None:
+        """ Draw all of the quads in the batch. """
+        if self._quad_count == 0:
+            return
+
+        vertices = (sdl2.render.SDL_Vertex * (self._quad_count * 4)).from_buffer(self._vertices)
+        result = sdl2.render.SDL_RenderGeometry(
+            self._renderer.sdlrenderer,
+            self._texture.tx,
+            vertices,
+            self._quad_count * 4,
+            self._indices,
+            self._quad_count * 6
+        )
+        if result != 0:
+            from sdl2.ext import SDLError
+            raise SDLError()
+
+        self._draw_calls += 1
+        self._quad_count = 0
+        self._texture = None
+
+    def _reserve(self, capacity: int) -> None:
+        """ Grow the vertex and index buffers to hold a number of quads. """
+        if capacity <= self._capacity:
+            return
+
+        vertices = bytearray(capacity * QUAD.size)
+        vertices[:len(self._vertices)] = self._vertices
+        self._vertices = vertices
+
+        indices = list()
+        for quad in range(capacity):
+            indices.extend(quad * 4 + i for i in QUAD_INDICES)
+        self._indices = (ctypes.c_int * len(indices))(*indices)
+
+        self._capacity = capacity
@@ -1,21 +1,24 @@
-from typing import Optional
+from __future__ import annotations
 
-import sdl2.ext
-import sdl2.render
-import sdl2.sdlimage
+from typing import TYPE_CHECKING
 
 from core.content import Content
 from core.engine import Engine
 from core.datatypes.pivot import Pivot
 from core.datatypes.point import Point
 
+if TYPE_CHECKING:
+    import sdl2
+    import sdl2.ext
+
 
 class Text:
-    def __init__(self, font_content_path: str, font_size: int, font_color: sdl2.ext.Color) -> None:
+    def __init__(self, font_content_path: str, font_size: int, font_color: sdl2.ext.Color | sdl2.SDL_Color) -> None:
         self._engine = Engine.instance()
-        self._font = Content.load_font(font_content_path, font_size, font_color)
+        self._atlas = Content.load_glyph_atlas(font_content_path, font_size)
+        self._color = (font_color.r, font_color.g, font_color.b, font_color.a)
         self._text = ""
-        self._texture = None
+        self._width = 0
         self._pivot = Pivot()
 
     @property
@@ -28,21 +31,18 @@ class Text:
         if not isinstance(value, str):
             value = str(value)
         self._text = value
-        self._update_texture()
+        self._width = self._atlas.measure(value)
 
     @property
     def width(self) -> int:
         """ The width of the rendered text. """
-        if self._texture:
-            return self._texture.size[0]
-        else:
-            return 0
+        return self._width
 
     @property
     def height(self) -> int:
         """ The height of the rendered text. """
-        if self._texture:
-            return self._texture.size[1]
+        if self._text:
+            return self._atlas.height
         else:
             return 0
 
@@ -52,22 +52,18 @@ class Text:
         return self._pivot
 
     def draw(self, position: Point) -> None:
-        """ Draw the sprite at a given position. """
-        if self._texture:
-            pivot_offset = Point(self.pivot.x * self.width, self.pivot.y * self.height)
-            draw_position = position - pivot_offset
-            self._engine.renderer.copy(
-                src=self._texture,
-                srcrect=None,
-                dstrect=draw_position.to_tuple(),
-                angle=0,
-                center=None,
-                flip=sdl2.render.SDL_FLIP_NONE
-            )
+        """ Draw the text at a given position.
+        Each character is drawn as a quad from the font's glyph atlas, tinted with the text color.
+        """
+        batch = self._engine.sprite_batch
+        if not self._text or batch is None:
+            return
 
-    def _update_texture(self) -> None:
-        """ Update the texture when the text changes. """
-        engine = Engine.instance()
-        renderer = engine.renderer.sdlrenderer
-        surface = self._font.render_text(self.text)
-        self._texture = sdl2.ext.Texture(renderer, surface)
+        texture = self._atlas.texture
+        x = position.x - int(self._pivot.x * self._width)
+        y = position.y - int(self._pivot.y * self.height)
+        for character in self._text:
+            source, advance = self._atlas.glyph(character)
+            if source[2]:
+                batch.draw(texture, source, (x, y, source[2], source[3]), self._color)
+            x += advance
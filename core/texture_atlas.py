@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from core.datatypes.rect import Rect
+
+if TYPE_CHECKING:
+    from PIL.Image import Image
+    import sdl2.ext
+
+
+class TextureRegion:
+    """ A rectangular area of a texture. """
+    __slots__ = ("texture", "rect")
+
+    def __init__(self, texture: sdl2.ext.Texture, rect: Rect) -> None:
+        self.texture = texture
+        self.rect = rect
+
+    @property
+    def width(self) -> int:
+        """ The width of the region. """
+        return self.rect.width
+
+    @property
+    def height(self) -> int:
+        """ The height of the region. """
+        return self.rect.height
+
+    @property
+    def source(self) -> tuple[int, int, int, int]:
+        """ The source rectangle of the region, as a tuple. """
+        return self.rect.x, self.rect.y, self.rect.width, self.rect.height
+
+
+class TextureAtlas:
+    """ Packs many images into a few large pages.
+    Images are placed on shelves: they are sorted by height, and placed left to right in rows.
+    When a page runs out of room, a new page is started.
+    Packing only needs the size of each image, so a page's pixels can be built later, when the page is needed.
+    """
+    def __init__(self, page_size: int = 1024, padding: int = 1) -> None:
+        self._page_size = page_size
+        self._padding = padding
+
+        # The size of each page, and the names of the images on it
+        self._page_sizes: list[tuple[int, int]] = list()
+        self._page_contents: list[list[str]] = list()
+
+        # The page index and area of each image that was packed
+        self._regions: dict[str, tuple[int, Rect]] = dict()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._regions
+
+    @property
+    def page_count(self) -> int:
+        """ The number of pages in the atlas. """
+        return len(self._page_sizes)
+
+    def page_size(self, page_index: int) -> tuple[int, int]:
+        """ Get the width and height of a page. """
+        return self._page_sizes[page_index]
+
+    def page_contents(self, page_index: int) -> list[str]:
+        """ Get the names of the images on a page. """
+        return self._page_contents[page_index]
+
+    def region(self, name: str) -> tuple[int, Rect]:
+        """ Get the page index and area of a packed image. """
+        return self._regions[name]
+
+    def pack(self, sizes: dict[str, tuple[int, int]]) -> None:
+        """ Work out where every image goes, from the size of each image. """
+        padding = self._padding
+        page_size = self._page_size
+
+        # Place the tallest images first, so the shelves are filled evenly
+        order = sorted(sizes, key=lambda name: (-sizes[name][1], -sizes[name][0], name))
+
+        placements: list[list[tuple[str, int, int]]] = list()
+        oversized: list[list[tuple[str, int, int]]] = list()
+        x = y = shelf_height = 0
+        for name in order:
+            width, height = sizes[name]
+
+            # Images that are too large get a page of their own
+            if width + padding > page_size or height + padding > page_size:
+                oversized.append([(name, 0, 0)])
+                continue
+
+            # Start a new shelf
+            if placements and x + width + padding > page_size:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+
+            # Start a new page
+            if not placements or y + height + padding > page_size:
+                placements.append(list())
+                x = y = shelf_height = 0
+
+            placements[-1].append((name, x, y))
+            x += width + padding
+            shelf_height = max(shelf_height, height + padding)
+
+        # Pages are trimmed to the area that is in use
+        for placed in placements + oversized:
+            page_index = len(self._page_sizes)
+            page_width = max(x + sizes[name][0] for name, x, y in placed)
+            page_height = max(y + sizes[name][1] for name, x, y in placed)
+            self._page_sizes.append((page_width, page_height))
+            self._page_contents.append([name for name, x, y in placed])
+            for name, x, y in placed:
+                self._regions[name] = (page_index, Rect(x, y, *sizes[name]))
+
+    def build_page(self, page_index: int, images: dict[str, Image]) -> Image:
+        """ Build the image for a page, from the images that are placed on it. """
+        from PIL import Image
+
+        page = Image.new("RGBA", self._page_sizes[page_index], (0, 0, 0, 0))
+        for name in self._page_contents[page_index]:
+            rect = self._regions[name][1]
+            page.paste(images[name], (rect.x, rect.y))
+        return page
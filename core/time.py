@@ -11,6 +11,10 @@ class Time:
     # This controls the rate that time passes
     time_scale = 1.0
 
+    # How far the current frame is between the previous fixed step and the next one, from 0 to 1.
+    # Entities are drawn at this point between their previous and current positions.
+    alpha = 1.0
+
     @classmethod
     def update(cls, delta: float) -> None:
         """ Update the time. """
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import sdl2.timer
+
+from core.frame_timer import FrameTimer, PhaseStats
+
+
+# Pacing error is stored as a single phase in a frame timer
+PACING_ERROR = "pacing_error"
+
+
+class FramePacer:
+    """ Waits until a deadline without spinning the CPU the whole time.
+    Most of the wait is a coarse SDL_Delay. The last part, which SDL_Delay can't hit precisely, is a short spin.
+    Time is measured with the high resolution performance counter.
+    """
+    def __init__(self, spin_time: float = 0.002, capacity: int = 600) -> None:
+        # How long before the deadline to stop sleeping and start spinning (in seconds)
+        self.spin_time = spin_time
+
+        self._frequency = sdl2.timer.SDL_GetPerformanceFrequency()
+
+        # How late each wait woke up, and the number of deadlines that had already passed when the wait started
+        self._errors = FrameTimer(capacity, (PACING_ERROR, ))
+        self._missed_deadlines = 0
+        self._waits = 0
+
+    @property
+    def missed_deadlines(self) -> int:
+        """ The number of waits where the deadline had already passed. """
+        return self._missed_deadlines
+
+    @property
+    def waits(self) -> int:
+        """ The number of waits. """
+        return self._waits
+
+    def now(self) -> float:
+        """ The current time (in seconds). """
+        return sdl2.timer.SDL_GetPerformanceCounter() / self._frequency
+
+    def wait_until(self, deadline: float) -> float:
+        """ Wait until a time from 'now'. Returns the time that the wait ended. """
+        self._waits += 1
+        now = self.now()
+        if now >= deadline:
+            self._missed_deadlines += 1
+            return now
+
+        # Sleep for most of the time
+        sleep_time = deadline - now - self.spin_time
+        if sleep_time >= 0.001:
+            sdl2.timer.SDL_Delay(int(sleep_time * 1000))
+
+        # Spin for the rest
+        now = self.now()
+        while now < deadline:
+            now = self.now()
+
+        self._errors.record(PACING_ERROR, now - deadline)
+        return now
+
+    def error_stats(self, window: Optional[int] = None) -> Optional[PhaseStats]:
+        """ Get stats for how late recent waits woke up (in seconds). """
+        return self._errors.stats(PACING_ERROR, window)
+
+    def report(self) -> str:
+        """ Get a summary of the pacing error and missed deadlines. """
+        lines = [f"{self._missed_deadlines} of {self._waits} deadlines missed"]
+        stats = self.error_stats()
+        if stats:
+            lines.append(
+                f"error (ms): min {stats.min * 1000:.3f}  avg {stats.avg * 1000:.3f}  "
+                f"p95 {stats.p95 * 1000:.3f}  p99 {stats.p99 * 1000:.3f}  max {stats.max * 1000:.3f}"
+            )
+        return "\n".join(lines)
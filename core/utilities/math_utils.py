@@ -1,3 +1,6 @@
+import math
+
+
 def sign(n: float) -> int:
     """ Return the sign of a number. """
     if n < 0:
@@ -27,3 +30,18 @@ def remap(value: float, old_min: float, old_max: float, new_min: float, new_max:
 def snap_to_interval(value: float, interval: int) -> int:
     """ Snap a number to the nearest interval. """
     return round_to_int(value / float(interval)) * interval
+
+
+def fold(value: float, min_value: float, max_value: float) -> float:
+    """ Reflect a number into the inclusive range of min and max, as if it bounced back and forth between them. """
+    span = max_value - min_value
+    if span <= 0:
+        return min_value
+
+    # Wrap into one round trip, then mirror the way back
+    period = span * 2
+    offset = value - min_value
+    offset -= period * math.floor(offset / period)
+    if offset > span:
+        offset = period - offset
+    return min_value + offset
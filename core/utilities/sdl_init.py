@@ -1,25 +1,68 @@
 import os
 from pathlib import Path
 
+from core.utilities.startup_timer import StartupTimer
 
-def initialize_sdl() -> None:
-    """ Initialize SDL. """
+
+# Tracks which optional libraries have been started
+_image_initialized = False
+_mixer_initialized = False
+
+
+def initialize_sdl(headless: bool = False, lazy: bool = False) -> None:
+    """ Initialize SDL.
+    When running headless, the video, image and audio subsystems are not started.
+    When 'lazy' is True, SDL_image and SDL_mixer are not started until they are first used.
+    """
     # DLL path must be set before SDL is imported
     project_root = Path(__file__).parent.parent.parent
     sdl2_dll = project_root / "dll"
     os.environ['PYSDL2_DLL_PATH'] = sdl2_dll.as_posix()
 
     # Now we can import SDL2 and initialize it
-    import sdl2.ext
-    sdl2.ext.init()
-
-    import sdl2.sdlimage
-    sdl2.sdlimage.IMG_Init(sdl2.sdlimage.IMG_INIT_PNG)
-
-    import sdl2.sdlmixer
-    sdl2.sdlmixer.Mix_OpenAudio(
-        sdl2.sdlmixer.MIX_DEFAULT_FREQUENCY,
-        sdl2.sdlmixer.MIX_DEFAULT_FORMAT,
-        sdl2.sdlmixer.MIX_DEFAULT_CHANNELS,
-        2048
-    )
+    # sdl2.ext is not imported here, since it also imports PIL, numpy and SDL_image
+    with StartupTimer.phase("import sdl2"):
+        import sdl2
+
+    if headless:
+        with StartupTimer.phase("SDL_Init (events)"):
+            if sdl2.SDL_Init(sdl2.SDL_INIT_EVENTS) != 0:
+                raise RuntimeError(sdl2.SDL_GetError().decode("utf-8"))
+        return
+
+    with StartupTimer.phase("SDL_Init (video, events)"):
+        if sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO | sdl2.SDL_INIT_EVENTS) != 0:
+            raise RuntimeError(sdl2.SDL_GetError().decode("utf-8"))
+
+    if not lazy:
+        ensure_image()
+        ensure_mixer()
+
+
+def ensure_image() -> None:
+    """ Start SDL_image, if it hasn't been started yet. """
+    global _image_initialized
+    if _image_initialized:
+        return
+
+    with StartupTimer.phase("IMG_Init"):
+        import sdl2.sdlimage
+        sdl2.sdlimage.IMG_Init(sdl2.sdlimage.IMG_INIT_PNG)
+    _image_initialized = True
+
+
+def ensure_mixer() -> None:
+    """ Start SDL_mixer and open the audio device, if it hasn't been done yet. """
+    global _mixer_initialized
+    if _mixer_initialized:
+        return
+
+    with StartupTimer.phase("Mix_OpenAudio"):
+        import sdl2.sdlmixer
+        sdl2.sdlmixer.Mix_OpenAudio(
+            sdl2.sdlmixer.MIX_DEFAULT_FREQUENCY,
+            sdl2.sdlmixer.MIX_DEFAULT_FORMAT,
+            sdl2.sdlmixer.MIX_DEFAULT_CHANNELS,
+            2048
+        )
+    _mixer_initialized = True
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class StartupTimer:
+    """ Times each phase of startup (imports, SDL initialization, loading the first scene).
+    Phases are only recorded when the timer is enabled, and only until startup finishes.
+    """
+    enabled = False
+
+    # The time that the timer module was imported, which is treated as the start of the program
+    __start = time.perf_counter()
+
+    # Name and duration (in seconds) of each phase, in the order they finished
+    __phases: list[tuple[str, float]] = list()
+
+    # Nesting depth of the phase that is running
+    __depth = 0
+
+    __finished = False
+
+    @classmethod
+    def recording(cls) -> bool:
+        """ True if phases are being recorded. """
+        return cls.enabled and not cls.__finished
+
+    @classmethod
+    @contextmanager
+    def phase(cls, name: str) -> Iterator[None]:
+        """ Time a phase of startup. Phases can be nested. """
+        if not cls.recording():
+            yield
+            return
+
+        index = len(cls.__phases)
+        cls.__phases.append(("  " * cls.__depth + name, 0.0))
+        cls.__depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cls.__depth -= 1
+            cls.__phases[index] = (cls.__phases[index][0], time.perf_counter() - start)
+
+    @classmethod
+    def finish(cls) -> None:
+        """ Stop recording, and print the report if the timer is enabled. """
+        if not cls.recording():
+            return
+        cls.__finished = True
+        print(cls.report())
+
+    @classmethod
+    def report(cls) -> str:
+        """ Get a table of every phase and how long it took. """
+        total = time.perf_counter() - cls.__start
+        lines = ["Startup time"]
+        width = max([len(name) for name, duration in cls.__phases] + [5])
+        for name, duration in cls.__phases:
+            lines.append(f"  {name:<{width}}  {duration * 1000:8.1f} ms")
+        lines.append(f"  {'Total':<{width}}  {total * 1000:8.1f} ms")
+        return "\n".join(lines)
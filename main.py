@@ -1,18 +1,80 @@
+import argparse
 import sys
+from pathlib import Path
+from typing import Optional
 
+from core.utilities.startup_timer import StartupTimer
 from core.utilities.sdl_init import initialize_sdl
 
 
 def main() -> int:
-    initialize_sdl()
-    start_game()
+    args = parse_args()
+    StartupTimer.enabled = args.startup_report
+
+    initialize_sdl(headless=args.headless is not None or args.replay is not None, lazy=args.lazy_init)
+    if args.replay is not None:
+        return 1 if replay(args.replay) else 0
+    if args.headless is not None:
+        run_headless(args.headless)
+    else:
+        start_game(args.record)
     return 0
 
 
-def start_game() -> None:
+def parse_args() -> argparse.Namespace:
+    """ Parse the command line arguments. """
+    parser = argparse.ArgumentParser(description="Pong")
+    parser.add_argument(
+        "--lazy-init",
+        action="store_true",
+        help="start SDL_image and SDL_mixer the first time they are used, instead of at startup"
+    )
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print how long each import and initialization phase took"
+    )
+    parser.add_argument(
+        "--headless",
+        type=int,
+        metavar="STEPS",
+        help="simulate a number of steps without a window or audio, then exit"
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        metavar="FILE",
+        help="record the input of every step, and save it to a file when the game exits"
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        nargs="+",
+        metavar="FILE",
+        help="replay recorded runs without a window or audio, and check that they still match their recordings"
+    )
+    return parser.parse_args()
+
+
+def start_game(record_file: Optional[Path] = None) -> None:
     """ Start the game. """
-    from pong import game
-    game.run()
+    with StartupTimer.phase("import pong.game"):
+        from pong import game
+    game.run(record_file)
+
+
+def run_headless(steps: int) -> None:
+    """ Simulate the game without a window. """
+    with StartupTimer.phase("import pong.game"):
+        from pong import game
+    game.run_headless(steps)
+
+
+def replay(file_paths: list[Path]) -> int:
+    """ Replay recorded runs without a window. Returns the number of runs that diverged. """
+    with StartupTimer.phase("import pong.game"):
+        from pong import game
+    return game.replay_files(file_paths)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,484 @@
+""" Steps many independent Pong matches at once, with one NumPy array element per match.
+Every rule follows the entities in pong.entities exactly, including the order of floating point operations, the
+rounding of movement remainders and the order of random draws. A match with a seed gives the same positions, scores
+and states as a GameScene whose engine was reseeded with that seed, fed the same player input.
+"""
+from __future__ import annotations
+
+import random
+from typing import Optional, Sequence
+
+import numpy as np
+
+from core.datatypes.vector2 import Vector2
+from core.engine import TIMESTEP
+from pong import constants
+
+
+# Game manager states (pong.entities.game_manager.GameState)
+GAME_WAITING = 0
+GAME_PLAYING = 1
+GAME_SCORED = 2
+
+# Computer states (pong.entities.computer_paddle.ComputerState)
+COMPUTER_WAITING = 0
+COMPUTER_THINKING = 1
+COMPUTER_MOVING = 2
+
+# Ball size and paddle size. Both are pivoted on their center.
+BALL_HALF_SIZE = 3
+PADDLE_HALF_WIDTH = 2
+PADDLE_HALF_HEIGHT = 12
+
+# Ball and paddle starting positions
+BALL_START_X = constants.SCREEN_WIDTH / 2
+BALL_START_Y = constants.SCREEN_HEIGHT / 2
+PLAYER_X = 20
+COMPUTER_X = 300
+PADDLE_START_Y = 90
+
+# The ball and a paddle overlap when their centers are closer than these on both axes
+OVERLAP_X = BALL_HALF_SIZE + PADDLE_HALF_WIDTH
+OVERLAP_Y = BALL_HALF_SIZE + PADDLE_HALF_HEIGHT
+
+# Ball.calculate_score_position predicts where the ball's center is when a paddle could touch it,
+# bouncing between the top and bottom of the screen
+PLAYER_GOAL_X = PLAYER_X + PADDLE_HALF_WIDTH + 1 + BALL_HALF_SIZE
+COMPUTER_GOAL_X = COMPUTER_X - PADDLE_HALF_WIDTH - 1 - BALL_HALF_SIZE
+BALL_TOP = BALL_HALF_SIZE
+BALL_BOTTOM = constants.SCREEN_HEIGHT - BALL_HALF_SIZE
+
+# Ball.on_hit_paddle snaps the bounce angle to this interval
+ANGLE_INTERVAL = 15
+
+
+def rotation_table(max_angle: int) -> np.ndarray:
+    """ Get the direction that the ball leaves a paddle with, for every snapped angle.
+    The directions are made with Vector2.rotate, so they are bit for bit the same as the entity's.
+    Indexed by [leaves to the right, angle / ANGLE_INTERVAL + max_angle / ANGLE_INTERVAL, axis].
+    """
+    steps = max_angle // ANGLE_INTERVAL
+    table = np.zeros((2, 2 * steps + 1, 2))
+    for side, start in enumerate((Vector2.left, Vector2.right)):
+        for index in range(2 * steps + 1):
+            direction = start()
+            direction.rotate((index - steps) * ANGLE_INTERVAL)
+            table[side, index] = direction.x, direction.y
+    return table
+
+
+def fold(value: np.ndarray, min_value: float, max_value: float) -> np.ndarray:
+    """ math_utils.fold, with the same floating point operations. """
+    span = max_value - min_value
+    period = span * 2
+    offset = value - min_value
+    offset -= period * np.floor(offset / period)
+    return min_value + np.where(offset > span, period - offset, offset)
+
+
+def first_contact(
+        position: np.ndarray,
+        cross_position: np.ndarray,
+        step: np.ndarray,
+        distance: np.ndarray,
+        overlap: int,
+        cross_overlap: int,
+        other_position: np.ndarray | int,
+        other_cross_position: np.ndarray | int
+) -> np.ndarray:
+    """ Get the first pixel step along an axis where two boxes overlap, or distance + 1 if they don't within distance.
+    The boxes overlap when their centers are closer than 'overlap' along the axis and 'cross_overlap' across it.
+    """
+    ahead = step * (other_position - position)
+    contact = np.maximum(1, ahead - overlap + 1)
+    touching = (
+        (np.abs(cross_position - other_cross_position) < cross_overlap) &
+        (contact < ahead + overlap) &
+        (contact <= distance)
+    )
+    return np.where(touching, contact, distance + 1)
+
+
+class BatchSimulator:
+    """ Simulates a number of matches in lockstep.
+    The player paddle is driven by input arrays passed to 'step', and the computer paddle uses the same
+    WAITING / THINKING / MOVING policy as ComputerPaddle. The tuning values can be changed to try out AI variants.
+    """
+    def __init__(
+            self,
+            count: int,
+            seeds: Optional[Sequence[int]] = None,
+            think_timer_min: float = 0.2,
+            think_timer_max: float = 0.5,
+            defense_error: float = 10,
+            move_speed: float = 2,
+            start_speed: float = 2,
+            max_angle: int = 60,
+            wait_timer_max: float = 3
+    ) -> None:
+        self.count = count
+
+        # Tuning values, with the same defaults as the entities
+        self.think_timer_min = think_timer_min
+        self.think_timer_max = think_timer_max
+        self.defense_error = defense_error
+        self.move_speed = move_speed
+        self.start_speed = start_speed
+        self.max_angle = max_angle
+        self.wait_timer_max = wait_timer_max
+        self._rotations = rotation_table(max_angle)
+
+        # Each match draws from its own generator, the same way a game scene draws from Engine.random
+        if seeds is None:
+            seeds = [random.randrange(2 ** 32) for _ in range(count)]
+        if len(seeds) != count:
+            raise ValueError(f"Expected {count} seeds, got {len(seeds)}")
+        self._random = [random.Random(seed) for seed in seeds]
+
+        # Game manager
+        self.game_state = np.full(count, GAME_WAITING, dtype=np.int8)
+        self.wait_timer = np.full(count, float(wait_timer_max))
+
+        # Ball
+        self.ball_x = np.full(count, BALL_START_X)
+        self.ball_y = np.full(count, BALL_START_Y)
+        self.ball_x_remainder = np.zeros(count)
+        self.ball_y_remainder = np.zeros(count)
+        self.direction_x = np.zeros(count)
+        self.direction_y = np.zeros(count)
+        self.speed = np.full(count, float(start_speed))
+        self.angle = np.zeros(count)
+        self.scored = np.zeros(count, dtype=bool)
+        self.score_position_x = np.zeros(count)
+        self.score_position_y = np.zeros(count)
+
+        # Paddles
+        self.player_y = np.full(count, float(PADDLE_START_Y))
+        self.player_y_remainder = np.zeros(count)
+        self.computer_y = np.full(count, float(PADDLE_START_Y))
+        self.computer_y_remainder = np.zeros(count)
+
+        # Computer
+        self.computer_state = np.full(count, COMPUTER_WAITING, dtype=np.int8)
+        self.think_timer = np.zeros(count)
+        self.move_target_y = np.zeros(count)
+
+        # Score, and the number of times the ball hit a paddle
+        self.player_1_score = np.zeros(count, dtype=np.int32)
+        self.player_2_score = np.zeros(count, dtype=np.int32)
+        self.hits = np.zeros(count, dtype=np.int32)
+
+        self.steps = 0
+
+    def run(self, steps: int, up: Optional[np.ndarray] = None, down: Optional[np.ndarray] = None) -> None:
+        """ Simulate a number of steps. If input arrays are given, they have one row per step. """
+        for index in range(steps):
+            self.step(
+                up[index] if up is not None else None,
+                down[index] if down is not None else None
+            )
+
+    def follow_ball_input(self, dead_zone: int = 3) -> tuple[np.ndarray, np.ndarray]:
+        """ Get the keys for a player that moves towards the ball whenever it is further away than the dead zone. """
+        up = self.ball_y < self.player_y - dead_zone
+        down = self.ball_y > self.player_y + dead_zone
+        return up, down
+
+    def step(self, up: Optional[np.ndarray] = None, down: Optional[np.ndarray] = None) -> None:
+        """ Simulate one fixed step of every match.
+        'up' and 'down' are boolean arrays with the player's arrow keys for each match.
+        """
+        # Entities update in the scene's order, then paddles are kept in bounds
+        self._update_game_manager()
+        self._update_ball()
+        self._update_player(up, down)
+        self._update_computer()
+        np.clip(self.player_y, PADDLE_HALF_HEIGHT, constants.SCREEN_HEIGHT - PADDLE_HALF_HEIGHT, out=self.player_y)
+        np.clip(self.computer_y, PADDLE_HALF_HEIGHT, constants.SCREEN_HEIGHT - PADDLE_HALF_HEIGHT, out=self.computer_y)
+        self.steps += 1
+
+    # Most rules only apply to a few matches in any step, like the ball being near a paddle or an edge.
+    # Those matches are found with one cheap test over every match, and the rule is applied to just their indices.
+
+    def _update_game_manager(self) -> None:
+        """ GameManager.update """
+        state = self.game_state
+        waiting = np.flatnonzero(state == GAME_WAITING)
+        scored = np.flatnonzero(state == GAME_SCORED)
+        state[(state == GAME_PLAYING) & self.scored] = GAME_SCORED
+
+        # Count down, then launch the ball
+        self.wait_timer[waiting] -= TIMESTEP
+        launch = waiting[self.wait_timer[waiting] <= 0]
+        self._launch_ball(launch)
+        state[launch] = GAME_PLAYING
+
+        # Reset the ball after a point
+        self.scored[scored] = False
+        self.speed[scored] = self.start_speed
+        self.direction_x[scored] = 0
+        self.direction_y[scored] = 0
+        self.ball_x[scored] = BALL_START_X
+        self.ball_y[scored] = BALL_START_Y
+        self.wait_timer[scored] = self.wait_timer_max
+        state[scored] = GAME_WAITING
+
+    def _launch_ball(self, indices: np.ndarray) -> None:
+        """ Ball.launch_ball """
+        if not len(indices):
+            return
+
+        rngs = self._random
+        self.direction_x[indices] = [-1 if rngs[index].random() < .5 else 1 for index in indices]
+        self.direction_y[indices] = 0
+        self.speed[indices] = self.start_speed
+        self._calculate_score_position(indices)
+
+    def _update_ball(self) -> None:
+        """ Ball.update """
+        x = self.ball_x
+        y = self.ball_y
+        direction_x = self.direction_x
+        direction_y = self.direction_y
+
+        # Score at the left and right edges
+        edge = np.flatnonzero((x <= BALL_HALF_SIZE) | (x >= constants.SCREEN_WIDTH - BALL_HALF_SIZE))
+        if len(edge):
+            left = edge[(x[edge] - BALL_HALF_SIZE <= 0) & (direction_x[edge] < 0)]
+            right = edge[(x[edge] + BALL_HALF_SIZE >= constants.SCREEN_WIDTH) & (direction_x[edge] > 0)]
+            point = np.concatenate((left, right))
+            self.scored[point] = True
+            self.speed[point] = self.start_speed
+            direction_x[point] = 0
+            direction_y[point] = 0
+            self.player_2_score[left] += 1
+            self.player_1_score[right] += 1
+            self._reset_move_target(point)
+
+        # Bounce off the top and bottom edges
+        edge = np.flatnonzero((y <= BALL_HALF_SIZE) | (y >= constants.SCREEN_HEIGHT - BALL_HALF_SIZE))
+        if len(edge):
+            top = (y[edge] - BALL_HALF_SIZE <= 0) & (direction_y[edge] < 0)
+            bottom = ~top & (y[edge] + BALL_HALF_SIZE >= constants.SCREEN_HEIGHT) & (direction_y[edge] > 0)
+            direction_y[edge[top | bottom]] *= -1
+
+        # Move horizontally, and bounce off paddles
+        move = self._take_movement(self.ball_x_remainder, direction_x * self.speed)
+        distance = np.abs(move)
+        near = np.flatnonzero(
+            (x - distance < PLAYER_X + OVERLAP_X) | (x + distance > COMPUTER_X - OVERLAP_X)
+        )
+        near_x = x[near]
+        x += move
+        if len(near):
+            player_hit, computer_hit = self._sweep_ball(
+                near, near_x, y, move, OVERLAP_X, OVERLAP_Y, (PLAYER_X, self.player_y), (COMPUTER_X, self.computer_y)
+            )
+            x[near] = near_x
+            self.computer_state[computer_hit] = COMPUTER_WAITING
+            self._hit_paddle(player_hit, self.player_y)
+            self._hit_paddle(computer_hit, self.computer_y)
+
+        # Move vertically, and bounce off the top or bottom of paddles
+        move = self._take_movement(self.ball_y_remainder, direction_y * self.speed)
+        near = np.flatnonzero((x < PLAYER_X + OVERLAP_X) | (x > COMPUTER_X - OVERLAP_X))
+        near_y = y[near]
+        y += move
+        if len(near):
+            player_hit, computer_hit = self._sweep_ball(
+                near, near_y, x, move, OVERLAP_Y, OVERLAP_X, (self.player_y, PLAYER_X), (self.computer_y, COMPUTER_X)
+            )
+            y[near] = near_y
+            self.computer_state[computer_hit] = COMPUTER_WAITING
+            direction_y[np.concatenate((player_hit, computer_hit))] *= -1
+
+    @staticmethod
+    def _take_movement(remainder: np.ndarray, amount: np.ndarray) -> np.ndarray:
+        """ Add an amount to movement remainders, and take the whole pixels out of them (Actor.move_x / move_y).
+        Returns the number of pixels to move.
+        Remainders are always within half a pixel after moving, so matches that don't move round to zero.
+        """
+        remainder += amount
+
+        # np.rint rounds halves to even, like Python's round
+        move = np.rint(remainder)
+        remainder -= move
+        return move
+
+    @staticmethod
+    def _sweep_ball(
+            indices: np.ndarray,
+            position: np.ndarray,
+            cross_position: np.ndarray,
+            move: np.ndarray,
+            overlap: int,
+            cross_overlap: int,
+            player: tuple[np.ndarray | int, np.ndarray | int],
+            computer: tuple[np.ndarray | int, np.ndarray | int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """ Move the ball along one axis up to the first paddle it touches (Actor._move_swept).
+        'position' has the positions of the balls at 'indices' before moving, and is moved in place.
+        Each paddle is given as its position along the axis of movement, and on the other axis.
+        Returns the indices where the ball touched the player and the computer.
+        """
+        move = move[indices]
+        step = np.sign(move)
+        distance = np.abs(move)
+        cross_position = cross_position[indices]
+
+        def paddle_contact(along: np.ndarray | int, cross: np.ndarray | int) -> np.ndarray:
+            if isinstance(along, np.ndarray):
+                along = along[indices]
+            if isinstance(cross, np.ndarray):
+                cross = cross[indices]
+            return first_contact(position, cross_position, step, distance, overlap, cross_overlap, along, cross)
+
+        player_contact = paddle_contact(*player)
+        computer_contact = paddle_contact(*computer)
+        contact = np.minimum(player_contact, computer_contact)
+
+        # Move up to the contact point
+        position += step * np.minimum(contact - 1, distance)
+
+        touched = contact <= distance
+        return indices[touched & (player_contact == contact)], indices[touched & (computer_contact == contact)]
+
+    def _hit_paddle(self, indices: np.ndarray, paddle_y: np.ndarray) -> None:
+        """ Ball.on_hit_paddle """
+        if not len(indices):
+            return
+
+        # Where the ball hit the paddle, from -1 at the top to 1 at the bottom, using the same operations as remap
+        top = paddle_y[indices] - PADDLE_HALF_HEIGHT
+        contact_point = (self.ball_y[indices] - top) * 2 / (PADDLE_HALF_HEIGHT * 2) + -1
+        contact_point = np.maximum(-1, np.minimum(contact_point, 1))
+
+        # Bounce back at an angle
+        moving_right = self.direction_x[indices] > 0
+        angle = np.where(moving_right, self.max_angle * contact_point * -1, self.max_angle * contact_point)
+        angle = np.rint(angle / float(ANGLE_INTERVAL)) * ANGLE_INTERVAL
+        self.angle[indices] = angle
+
+        # Look up the rotated direction
+        side = (~moving_right).astype(np.intp)
+        angle_index = (angle // ANGLE_INTERVAL).astype(np.intp) + self.max_angle // ANGLE_INTERVAL
+        self.direction_x[indices] = self._rotations[side, angle_index, 0]
+        self.direction_y[indices] = self._rotations[side, angle_index, 1]
+        self._calculate_score_position(indices)
+
+        self.speed[indices] += .1
+        self.hits[indices] += 1
+
+    def _calculate_score_position(self, indices: np.ndarray) -> None:
+        """ Ball.calculate_score_position """
+        x = np.trunc(self.ball_x[indices])
+        y = np.trunc(self.ball_y[indices])
+        direction_x = self.direction_x[indices]
+        direction_y = self.direction_y[indices]
+
+        # Matches where the ball isn't moving keep its position
+        moving = direction_x != 0
+        goal_x = np.where(direction_x < 0, PLAYER_GOAL_X, COMPUTER_GOAL_X)
+        distance = np.zeros(len(indices))
+        distance[moving] = np.maximum((goal_x[moving] - x[moving]) / direction_x[moving], 0)
+
+        self.score_position_x[indices] = x + distance * direction_x
+        self.score_position_y[indices] = fold(y + distance * direction_y, BALL_TOP, BALL_BOTTOM)
+
+    def _update_player(self, up: Optional[np.ndarray], down: Optional[np.ndarray]) -> None:
+        """ PlayerPaddle.update """
+        if up is not None:
+            self._move_paddle(self.player_y, self.player_y_remainder, PLAYER_X, up * -float(self.move_speed))
+        if down is not None:
+            self._move_paddle(self.player_y, self.player_y_remainder, PLAYER_X, down * float(self.move_speed))
+
+    def _move_paddle(self, paddle_y: np.ndarray, remainder: np.ndarray, paddle_x: int, amount: np.ndarray) -> np.ndarray:
+        """ Move paddles vertically one pixel at a time, stopping before they overlap the ball (Actor.move_y).
+        Matches where the paddle doesn't move have an amount of zero.
+        Returns the indices of the paddles that touched the ball.
+        """
+        move = self._take_movement(remainder, amount)
+
+        # Only a paddle level with the ball can touch it
+        near = np.flatnonzero((move != 0) & (np.abs(self.ball_x - paddle_x) < OVERLAP_X))
+        near_y = paddle_y[near]
+        paddle_y += move
+        if not len(near):
+            return near
+
+        # Stop before the first pixel where the paddle would overlap the ball
+        move = move[near]
+        step = np.sign(move)
+        distance = np.abs(move)
+        contact = first_contact(
+            near_y, paddle_x, step, distance, OVERLAP_Y, OVERLAP_X, self.ball_y[near], self.ball_x[near]
+        )
+        paddle_y[near] = near_y + step * np.minimum(contact - 1, distance)
+        return near[contact <= distance]
+
+    def _update_computer(self) -> None:
+        """ ComputerPaddle.update """
+        state = self.computer_state
+        waiting = np.flatnonzero(state == COMPUTER_WAITING)
+        thinking = np.flatnonzero(state == COMPUTER_THINKING)
+        moving = np.flatnonzero(state == COMPUTER_MOVING)
+
+        # Start thinking when the ball comes towards the computer
+        start = waiting[self.direction_x[waiting] > 0]
+        timer_scale = (np.trunc(self.ball_x[start]) - PLAYER_X) * (0.5 - 1) / (COMPUTER_X - PLAYER_X) + 1
+        self.think_timer[start] = np.maximum(self.think_timer_max * timer_scale, self.think_timer_min)
+        state[start] = COMPUTER_THINKING
+
+        # Think, then pick a position to defend
+        counting = self.think_timer[thinking] > 0
+        self.think_timer[thinking[counting]] -= TIMESTEP
+        self._pick_defense_position(thinking[~counting])
+
+        # Move towards the target
+        computer_y = self.computer_y[moving]
+        move_delta = self.move_target_y[moving] - np.trunc(computer_y)
+        settled = (
+            (np.abs(move_delta) < 2) |
+            (computer_y - PADDLE_HALF_HEIGHT == 0) |
+            (computer_y + PADDLE_HALF_HEIGHT == constants.SCREEN_HEIGHT)
+        )
+        state[moving[settled]] = COMPUTER_WAITING
+
+        move_direction = np.where(move_delta < 0, -1, 1)
+        amount = np.zeros(self.count)
+        amount[moving] = np.minimum(self.move_speed, np.abs(move_delta)) * move_direction
+        touched = self._move_paddle(self.computer_y, self.computer_y_remainder, COMPUTER_X, amount)
+        state[touched] = COMPUTER_WAITING
+
+    def _pick_defense_position(self, indices: np.ndarray) -> None:
+        """ ComputerPaddle.pick_defense_position, then set_state(MOVING) """
+        if not len(indices):
+            return
+
+        # Scale the error the same way, in the same order
+        ball_x = np.trunc(self.ball_x[indices])
+        error = np.full(len(indices), float(self.defense_error))
+        error *= (np.abs(self.angle[indices] / self.max_angle) - 0) * (1 - .5) / (1 - 0) + .5
+        error *= (ball_x - PLAYER_X) * (0 - 1) / (COMPUTER_X - PLAYER_X) + 1
+        error *= (self.speed[indices] / 10) + 1
+
+        rngs = self._random
+        flip = np.array([rngs[index].random() > 0.5 for index in indices])
+        error[flip] *= -1
+
+        self.move_target_y[indices] = self.score_position_y[indices] + error
+        self._set_moving(indices)
+
+    def _reset_move_target(self, indices: np.ndarray) -> None:
+        """ ComputerPaddle.reset_move_target """
+        if not len(indices):
+            return
+
+        rngs = self._random
+        self.move_target_y[indices] = [rngs[index].randint(80, 100) for index in indices]
+        self._set_moving(indices)
+
+    def _set_moving(self, indices: np.ndarray) -> None:
+        """ ComputerPaddle.set_state(MOVING), which waits instead if the target is already close. """
+        close = np.abs(self.move_target_y[indices] - np.trunc(self.computer_y[indices])) < 4
+        self.computer_state[indices] = np.where(close, COMPUTER_WAITING, COMPUTER_MOVING)
@@ -1,8 +1,9 @@
-import random
-from typing import Optional, TYPE_CHECKING
+import functools
+from typing import Iterator, Optional, TYPE_CHECKING
 
 from core.datatypes.point import Point
 from core.datatypes.vector2 import Vector2
+from core.engine import Engine
 from core.entity import Entity
 from core.actor import Actor
 from core.sound import Sound
@@ -17,6 +18,10 @@ if TYPE_CHECKING:
 
 
 class Ball(Actor):
+    # Direction, speed, angle, scored, whether the score position is a Vector2 (rather than a Point) with its X and Y,
+    # and the hit count
+    STATE_FORMAT = Actor.STATE_FORMAT + "dddd??ddi"
+
     def __init__(self) -> None:
         super().__init__()
 
@@ -35,6 +40,7 @@ class Ball(Actor):
         self.start_speed = 2
         self.angle = 0
         self.max_angle = 60
+        self.swept_movement = True
 
         # Entity references
         self.score: Optional[Score] = None
@@ -50,6 +56,9 @@ class Ball(Actor):
         self.scored = False
         self.score_position = Point.zero()
 
+        # The number of times the ball has hit a paddle
+        self.hits = 0
+
     @property
     def velocity(self) -> Vector2:
         return self.direction * self.speed
@@ -70,7 +79,25 @@ class Ball(Actor):
         self.move_y(self.velocity.y, self.on_collide_y)
 
     def draw(self) -> None:
-        self.sprite.draw(self.position)
+        self.sprite.draw(self.render_position)
+
+    def save_state(self) -> tuple:
+        direction = self.direction
+        score_position = self.score_position
+        return super().save_state() + (
+            direction.x, direction.y, self.speed, self.angle, self.scored,
+            isinstance(score_position, Vector2), score_position.x, score_position.y, self.hits
+        )
+
+    def load_state(self, values: Iterator) -> None:
+        super().load_state(values)
+        self.direction = Vector2(next(values), next(values))
+        self.speed = next(values)
+        self.angle = next(values)
+        self.scored = next(values)
+        position_type = Vector2 if next(values) else Point
+        self.score_position = position_type(next(values), next(values))
+        self.hits = next(values)
 
     def reset_ball(self) -> None:
         """ Reset the ball's position in the center of the screen. """
@@ -78,6 +105,7 @@ class Ball(Actor):
         self.stop_ball()
         self.x = constants.SCREEN_WIDTH / 2
         self.y = constants.SCREEN_HEIGHT / 2
+        self.snap_previous_position()
 
     def stop_ball(self) -> None:
         """ Stop the ball's movement. """
@@ -87,7 +115,7 @@ class Ball(Actor):
     def launch_ball(self) -> None:
         """ Launch the ball in a random direction. """
         # Randomly pick left or right
-        if random.random() < .5:
+        if Engine.instance().random.random() < .5:
             direction = Vector2.left()
         else:
             direction = Vector2.right()
@@ -159,31 +187,49 @@ class Ball(Actor):
 
         # Increase the speed
         self.speed += .1
+        self.hits += 1
 
     def calculate_score_position(self) -> None:
         """ Calculate the position that the ball will be when it crosses the goal line.
         This is used by the computer paddle when it picks a position to defend.
         """
-        direction = self.direction.copy()
-        position = Vector2(*self.position)
-
-        player = self.player_paddle  # type: PlayerPaddle
-        computer = self.computer_paddle  # type: ComputerPaddle
-        while True:
-            # Update position
-            position += direction
-            bbox = self.bbox_at(int(position.x), int(position.y))
-
-            # Handle edge bounce
-            if bbox.top <= 0 and direction.y < 0:
-                direction.y *= -1
-            elif bbox.bottom >= constants.SCREEN_HEIGHT and direction.y > 0:
-                direction.y *= -1
-
-            # Exit if we're at the point where the paddle could touch the ball
-            if direction.x < 0 and bbox.left <= player.bbox.right + 1:
-                break
-            if direction.x > 0 and bbox.right >= computer.bbox.left - 1:
-                break
-
-        self.score_position = position
+        # The goal line is where the ball's center is when a paddle could touch it
+        half_size = self.width / 2
+        if self.direction.x < 0:
+            goal_x = self.player_paddle.bbox.right + 1 + half_size
+        else:
+            goal_x = self.computer_paddle.bbox.left - 1 - half_size
+
+        position = self.position
+        x, y = predict_crossing(
+            position.x,
+            position.y,
+            self.direction.x,
+            self.direction.y,
+            goal_x,
+            half_size,
+            constants.SCREEN_HEIGHT - half_size
+        )
+        self.score_position = Vector2(x, y)
+
+
+@functools.lru_cache(maxsize=4096)
+def predict_crossing(
+        x: float,
+        y: float,
+        direction_x: float,
+        direction_y: float,
+        goal_x: float,
+        top: float,
+        bottom: float
+) -> tuple[float, float]:
+    """ Get the position where a ball moving in a direction crosses a goal line, bouncing between a top and bottom.
+    The bounces are folded into a straight line, so this takes the same time for any number of them.
+    The ball only leaves a paddle in a few directions, so positions and snapped angles repeat, and results are cached.
+    If the ball isn't moving towards the goal line, its current position is returned.
+    """
+    if direction_x == 0:
+        return x, y
+
+    distance = max((goal_x - x) / direction_x, 0)
+    return x + distance * direction_x, math_utils.fold(y + distance * direction_y, top, bottom)
@@ -1,8 +1,9 @@
-import random
 from enum import Enum
-from typing import Optional, TYPE_CHECKING
+from typing import Iterator, Optional, TYPE_CHECKING
 
 from core.datatypes.point import Point
+from core.datatypes.vector2 import Vector2
+from core.engine import Engine
 from core.entity import Entity
 from core.time import Time
 from core.utilities import math_utils
@@ -20,7 +21,19 @@ class ComputerState(Enum):
     MOVING = "MOVING"
 
 
+# Computer states in the order that they are saved in state snapshots
+COMPUTER_STATES = tuple(ComputerState)
+
+# Types of move target in state snapshots
+NO_TARGET = 0
+POINT_TARGET = 1
+VECTOR_TARGET = 2
+
+
 class ComputerPaddle(Paddle):
+    # State, think timer, and the type of move target with its X and Y
+    STATE_FORMAT = Paddle.STATE_FORMAT + "BdBdd"
+
     def __init__(self):
         super().__init__()
         self._state = ComputerState.WAITING
@@ -34,6 +47,9 @@ class ComputerPaddle(Paddle):
         self.think_timer_min = 0.2
         self.think_timer = 0.0
 
+        # The most that the defense position can be off by, before it's scaled
+        self.defense_error = 10
+
     def initialize(self) -> None:
         self.x = 300
         self.y = 90
@@ -49,6 +65,31 @@ class ComputerPaddle(Paddle):
             case ComputerState.MOVING:
                 self.handle_moving_state()
 
+    def save_state(self) -> tuple:
+        move_target = self.move_target
+        if move_target is None:
+            target = (NO_TARGET, 0, 0)
+        elif isinstance(move_target, Vector2):
+            target = (VECTOR_TARGET, move_target.x, move_target.y)
+        else:
+            target = (POINT_TARGET, move_target.x, move_target.y)
+        return super().save_state() + (COMPUTER_STATES.index(self._state), self.think_timer) + target
+
+    def load_state(self, values: Iterator) -> None:
+        super().load_state(values)
+        self._state = COMPUTER_STATES[next(values)]
+        self.think_timer = next(values)
+
+        target_type = next(values)
+        x = next(values)
+        y = next(values)
+        if target_type == VECTOR_TARGET:
+            self.move_target = Vector2(x, y)
+        elif target_type == POINT_TARGET:
+            self.move_target = Point(x, y)
+        else:
+            self.move_target = None
+
     def set_state(self, state: ComputerState):
         """ Set the state of the computer. """
         # If we are trying to enter the move state, but the position change is small enough, go to waiting state.
@@ -91,7 +132,7 @@ class ComputerPaddle(Paddle):
         position = self.ball.score_position.copy()
 
         # The maximum amount of error
-        error = 10
+        error = self.defense_error
 
         # Scale the error by the current angle of the ball.
         # The greater the angle, the more error there should be.
@@ -112,7 +153,7 @@ class ComputerPaddle(Paddle):
         error *= speed_error
 
         # Randomly decide if the error will be in the positive or negative direction
-        if random.random() > 0.5:
+        if Engine.instance().random.random() > 0.5:
             error *= -1
 
         # Add error to position
@@ -139,7 +180,7 @@ class ComputerPaddle(Paddle):
 
     def reset_move_target(self) -> None:
         """ Reset the move target close to the starting position. """
-        self.move_target = Point(300, random.randint(80, 100))
+        self.move_target = Point(300, Engine.instance().random.randint(80, 100))
         self.set_state(ComputerState.MOVING)
 
     def on_collide(self, other: Entity) -> None:
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Iterator
 
 from core.entity import Entity
 from core.time import Time
@@ -10,7 +11,13 @@ class GameState(Enum):
     SCORED = 3
 
 
+# Game states in the order that they are saved in state snapshots
+GAME_STATES = tuple(GameState)
+
+
 class GameManager(Entity):
+    STATE_FORMAT = Entity.STATE_FORMAT + "Bd"
+
     def __init__(self):
         super().__init__()
         self.state = GameState.WAITING
@@ -34,6 +41,14 @@ class GameManager(Entity):
             case GameState.SCORED:
                 self.handle_scored_state()
 
+    def save_state(self) -> tuple:
+        return super().save_state() + (GAME_STATES.index(self.state), self.wait_timer)
+
+    def load_state(self, values: Iterator) -> None:
+        super().load_state(values)
+        self.state = GAME_STATES[next(values)]
+        self.wait_timer = next(values)
+
     def reset_state(self):
         self.state = GameState.WAITING
         self.wait_timer = self.wait_timer_max
@@ -27,4 +27,4 @@ class Paddle(Actor):
             self.y -= 1
 
     def draw(self) -> None:
-        self.sprite.draw(self.position)
+        self.sprite.draw(self.render_position)
@@ -1,4 +1,6 @@
-import sdl2.ext
+from typing import Iterator
+
+import sdl2
 
 from core.datatypes.point import Point
 from core.entity import Entity
@@ -7,12 +9,14 @@ from pong import constants
 
 
 class Score(Entity):
+    STATE_FORMAT = Entity.STATE_FORMAT + "ii"
+
     def __init__(self) -> None:
         super().__init__()
         self.player_1_score = 0
         self.player_2_score = 0
-        self.player_1_score_text = Text("m5x7.ttf", 32, sdl2.ext.Color(255, 253, 242))
-        self.player_2_score_text = Text("m5x7.ttf", 32, sdl2.ext.Color(255, 253, 242))
+        self.player_1_score_text = Text("m5x7.ttf", 32, sdl2.SDL_Color(255, 253, 242))
+        self.player_2_score_text = Text("m5x7.ttf", 32, sdl2.SDL_Color(255, 253, 242))
         self.score_spacing = 32
 
     def initialize(self) -> None:
@@ -40,6 +44,20 @@ class Score(Entity):
     def increase_player_2_score(self):
         self.set_player_2_score(self.player_2_score + 1)
 
+    def save_state(self) -> tuple:
+        return super().save_state() + (self.player_1_score, self.player_2_score)
+
+    def load_state(self, values: Iterator) -> None:
+        super().load_state(values)
+
+        # Only update the text if the score changed
+        player_1_score = next(values)
+        player_2_score = next(values)
+        if player_1_score != self.player_1_score:
+            self.set_player_1_score(player_1_score)
+        if player_2_score != self.player_2_score:
+            self.set_player_2_score(player_2_score)
+
     def draw(self) -> None:
         pos_1 = Point(self.position.x - self.score_spacing / 2, self.position.y)
         pos_2 = Point(self.position.x + self.score_spacing / 2 + 1, self.position.y)
@@ -1,24 +1,97 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Callable, Iterable, Optional, TYPE_CHECKING
+
+import sdl2.render
 import sdl2.video
-import sdl2.ext
 
+from core.content import Content, PACK_FILE
 from core.engine import Engine
+from core.replay import InputRecorder, InputRecording, replay
+from core.utilities.startup_timer import StartupTimer
 from pong import constants
 from pong.scenes.game_scene import GameScene
 
+if TYPE_CHECKING:
+    import sdl2.ext
+
+
+def run(record_file: Optional[Path] = None) -> None:
+    """ Run the game in a window.
+    If a record file is given, the input of every step is recorded, and saved to the file when the game exits.
+    """
+    mount_content_pack()
 
-def run() -> None:
     # Create engine
-    window = create_window("Pong", 1280, 720)
-    renderer = create_renderer(window, constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+    with StartupTimer.phase("Create window"):
+        window = create_window("Pong", 1280, 720)
+    with StartupTimer.phase("Create renderer"):
+        renderer = create_renderer(window, constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
     engine = Engine(window, renderer)
 
+    # Record input
+    recorder = None
+    if record_file:
+        recorder = InputRecorder()
+        recorder.start(engine)
+
     # Start game
     first_scene = GameScene()
-    engine.run(first_scene)
+    try:
+        engine.run(first_scene)
+    finally:
+        if recorder:
+            recorder.stop(engine).save(record_file)
+
+
+def run_headless(steps: Optional[int] = None, stop_condition: Optional[Callable[[Engine], bool]] = None) -> int:
+    """ Simulate the game without a window, as fast as possible.
+    Returns the number of steps that were simulated.
+    """
+    mount_content_pack()
+    engine = Engine()
+    first_scene = GameScene()
+    return engine.run_headless(first_scene, steps, stop_condition)
+
+
+def replay_files(file_paths: Iterable[Path]) -> int:
+    """ Replay recorded runs headless, and report any that don't match their recording.
+    Returns the number of runs that diverged.
+    """
+    mount_content_pack()
+    diverged = 0
+    for file_path in file_paths:
+        result = replay(InputRecording.load(file_path))
+        if result.diverged:
+            diverged += 1
+            print(
+                f"{file_path}: diverged at step {result.diverged_at} "
+                f"(expected {result.expected_hash}, got {result.actual_hash})"
+            )
+        else:
+            print(f"{file_path}: {result.steps} steps matched")
+    return diverged
+
+
+def mount_content_pack() -> None:
+    """ Load content from the pre-decoded content pack, if one has been built and is up to date.
+    Otherwise, content is loaded from the content folder.
+    """
+    if not PACK_FILE.exists():
+        return
+
+    try:
+        Content.mount_pack(PACK_FILE)
+    except RuntimeError as error:
+        print(f"{error}. Run 'python -m core.asset_pack' to rebuild it.", file=sys.stderr)
 
 
 def create_window(title: str, width: int, height: int) -> sdl2.ext.Window:
     """ Create a window. """
+    import sdl2.ext
+
     flags = 0
     flags |= sdl2.video.SDL_WINDOW_HIDDEN
     flags |= sdl2.video.SDL_WINDOW_RESIZABLE
@@ -29,6 +102,8 @@ def create_window(title: str, width: int, height: int) -> sdl2.ext.Window:
 
 def create_renderer(window: sdl2.ext.Window, virtual_width: int, virtual_height: int) -> sdl2.ext.Renderer:
     """ Create a renderer. """
+    import sdl2.ext
+
     flags = 0
     flags |= sdl2.render.SDL_RENDERER_ACCELERATED
     flags |= sdl2.render.SDL_RENDERER_PRESENTVSYNC
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The tests import the project the same way main.py does, from the project root
+sys.path.insert(0, Path(__file__).parent.parent.as_posix())
+
+
+@pytest.fixture(scope="session", autouse=True)
+def sdl() -> None:
+    """ Start SDL without a window or audio, the way headless runs do. """
+    from core.utilities.sdl_init import initialize_sdl
+    initialize_sdl(headless=True)
+
+    from pong.game import mount_content_pack
+    mount_content_pack()
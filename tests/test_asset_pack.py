@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+
+import pytest
+
+import core.content
+from core.asset_pack import AssetPack, build_pack
+from core.content import Content
+
+
+def build(content_root: Path, pack_file: Path) -> None:
+    content_root.mkdir()
+    (content_root / "a.txt").write_bytes(b"first")
+    (content_root / "b.txt").write_bytes(b"second")
+    build_pack(content_root, pack_file)
+
+
+def test_changed_and_removed_files_are_stale(tmp_path: Path) -> None:
+    content_root = tmp_path / "content"
+    pack_file = tmp_path / "content.pack"
+    build(content_root, pack_file)
+    assert AssetPack(pack_file).stale_files(content_root) == []
+
+    # Touching a file without changing its size still makes it stale
+    stat = os.stat(content_root / "a.txt")
+    os.utime(content_root / "a.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    (content_root / "b.txt").unlink()
+    assert AssetPack(pack_file).stale_files(content_root) == ["a.txt", "b.txt"]
+
+
+def test_stale_pack_is_not_mounted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    content_root = tmp_path / "content"
+    pack_file = tmp_path / "content.pack"
+    build(content_root, pack_file)
+    (content_root / "a.txt").write_bytes(b"changed")
+    monkeypatch.setattr(core.content, "CONTENT_ROOT", content_root)
+
+    mounted = Content.pack()
+    with pytest.raises(RuntimeError, match="a.txt"):
+        Content.mount_pack(pack_file)
+    assert Content.pack() is mounted
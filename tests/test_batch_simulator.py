@@ -0,0 +1,87 @@
+import numpy as np
+import sdl2
+
+from core.engine import Engine
+from core.entity import Entity
+from core.input import Input
+from pong import batch_simulator
+from pong.batch_simulator import BatchSimulator
+from pong.scenes.game_scene import GameScene
+
+SEEDS = (3, 11, 42, 1234)
+STEPS = 3000
+
+
+def play(seed: int) -> tuple[np.ndarray, np.ndarray, list[tuple]]:
+    """ Play a game scene with a player that follows the ball.
+    Returns the player's keys for each step, and the state of the ball, paddles and score after each step.
+    """
+    engine = Engine()
+    engine.reseed(seed)
+    engine.scene = GameScene()
+    engine.step()
+
+    ball = Entity.find("Ball")
+    player = Entity.find("Player")
+    computer = Entity.find("Computer")
+    score = Entity.find("Score")
+
+    up = np.zeros(STEPS, dtype=bool)
+    down = np.zeros(STEPS, dtype=bool)
+    states = list()
+    for step in range(STEPS):
+        up[step] = ball.y < player.y - 3
+        down[step] = ball.y > player.y + 3
+        Input.set_keys([key for key, pressed in ((sdl2.SDLK_UP, up[step]), (sdl2.SDLK_DOWN, down[step])) if pressed])
+        engine.step()
+        states.append((
+            ball.x, ball.y, ball.direction.x, ball.direction.y, ball.speed, ball.hits,
+            player.y, computer.y, score.player_1_score, score.player_2_score
+        ))
+
+    Input.set_keys(())
+    return up, down, states
+
+
+def batch_state(simulator: BatchSimulator, match: int) -> tuple:
+    return (
+        simulator.ball_x[match], simulator.ball_y[match],
+        simulator.direction_x[match], simulator.direction_y[match],
+        simulator.speed[match], simulator.hits[match],
+        simulator.player_y[match], simulator.computer_y[match],
+        simulator.player_1_score[match], simulator.player_2_score[match]
+    )
+
+
+def test_constants_match_entities() -> None:
+    engine = Engine()
+    engine.scene = GameScene()
+    engine.step()
+
+    ball = Entity.find("Ball")
+    player = Entity.find("Player")
+    computer = Entity.find("Computer")
+
+    assert (ball.x, ball.y) == (batch_simulator.BALL_START_X, batch_simulator.BALL_START_Y)
+    assert ball.width / 2 == ball.height / 2 == batch_simulator.BALL_HALF_SIZE
+    for paddle, x in ((player, batch_simulator.PLAYER_X), (computer, batch_simulator.COMPUTER_X)):
+        assert (paddle.x, paddle.y) == (x, batch_simulator.PADDLE_START_Y)
+        assert paddle.width / 2 == batch_simulator.PADDLE_HALF_WIDTH
+        assert paddle.height / 2 == batch_simulator.PADDLE_HALF_HEIGHT
+
+
+def test_matches_game_scene() -> None:
+    """ Every match in a batch follows the same path as a game scene with the same seed and input. """
+    games = [play(seed) for seed in SEEDS]
+    up = np.stack([game[0] for game in games], axis=1)
+    down = np.stack([game[1] for game in games], axis=1)
+
+    simulator = BatchSimulator(len(SEEDS), SEEDS)
+    for step in range(STEPS):
+        simulator.step(up[step], down[step])
+        for match, game in enumerate(games):
+            assert batch_state(simulator, match) == game[2][step], f"seed {SEEDS[match]} differs at step {step}"
+
+    # The matches should have been long enough to score and hit the paddles
+    assert simulator.hits.sum() > 0
+    assert (simulator.player_1_score + simulator.player_2_score).sum() > 0
@@ -0,0 +1,24 @@
+import pytest
+
+from core.content import Content
+from core.engine import Engine
+
+
+def test_preloaded_font_is_opened_from_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Fonts in a mounted pack are never read from the content folder, so test without one
+    monkeypatch.setattr(Content, "in_pack", lambda content_path: False)
+
+    Engine()
+    request = Content.preload(["m5x7.ttf"])
+    while not request.done:
+        Content.process_preloads()
+    assert ("file", "m5x7.ttf") in Content.cache()
+
+    # Loading the font must not read it from the content folder again
+    def full_content_path(content_path: str) -> None:
+        raise AssertionError(f"{content_path} was read again")
+    monkeypatch.setattr(Content, "full_content_path", full_content_path)
+
+    glyph_atlas = Content.load_glyph_atlas("m5x7.ttf", 17)
+    assert glyph_atlas.height > 0
+    assert glyph_atlas.measure("123") > 0
@@ -0,0 +1,44 @@
+from core.content_cache import ContentCache
+
+
+def test_load_with_budget_smaller_than_asset() -> None:
+    """ An asset that is bigger than the whole budget can still be loaded and acquired. """
+    cache = ContentCache(memory_budget=10)
+    cache.add("atlas", "atlas asset", 100)
+    assert cache.acquire("atlas", "scene") == "atlas asset"
+    assert cache.references("atlas") == 1
+
+    # Once it's released, it is over the budget and is freed
+    cache.release_scope("scene")
+    assert "atlas" not in cache
+    assert cache.memory_used == 0
+
+
+def test_referenced_assets_dont_count_against_budget() -> None:
+    freed = list()
+    cache = ContentCache(memory_budget=50)
+
+    cache.add("big", "big asset", 100, freed.append)
+    cache.acquire("big", "scene")
+
+    # The unreferenced assets fit in the budget on their own, so they stay cached
+    cache.add("small 1", "small asset 1", 20, freed.append)
+    cache.add("small 2", "small asset 2", 20, freed.append)
+    assert freed == []
+
+    # Going over the budget frees the least recently used unreferenced asset
+    cache.add("small 3", "small asset 3", 20, freed.append)
+    assert freed == ["small asset 1"]
+    assert "big" in cache
+    assert "small 3" in cache
+
+
+def test_lowering_budget_keeps_referenced_assets() -> None:
+    cache = ContentCache()
+    cache.add("texture", "texture asset", 100)
+    cache.acquire("texture", "scene")
+    cache.add("sound", "sound asset", 100)
+
+    cache.memory_budget = 0
+    assert "texture" in cache
+    assert "sound" not in cache
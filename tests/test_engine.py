@@ -0,0 +1,24 @@
+import gc
+
+from core.content import Content
+from core.engine import Engine
+from pong.scenes.game_scene import GameScene
+
+
+def play_match(seed: int) -> None:
+    """ Start a new headless engine and play a short match, the way each match of a tuning run does. """
+    engine = Engine()
+    engine.reseed(seed)
+    engine.run_headless(GameScene(), 120)
+
+
+def test_repeated_matches_dont_accumulate_scenes() -> None:
+    play_match(0)
+    scopes = len(Content.cache()._scopes)
+
+    for seed in range(1, 30):
+        play_match(seed)
+
+    assert len(Content.cache()._scopes) == scopes
+    gc.collect()
+    assert sum(isinstance(item, GameScene) for item in gc.get_objects()) == 1
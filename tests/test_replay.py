@@ -0,0 +1,32 @@
+import random
+
+import sdl2
+
+from core.engine import Engine
+from core.input import Input
+from core.replay import InputRecorder, replay
+from core.time import Time
+from pong.scenes.game_scene import GameScene
+
+
+def test_replay_matches_when_alpha_changes_between_steps() -> None:
+    """ Windowed runs set the interpolation alpha from the wall clock before each draw. It isn't simulation state. """
+    engine = Engine()
+    recorder = InputRecorder()
+    recorder.start(engine, seed=7)
+
+    script = random.Random(3)
+
+    def draw_between_steps(_engine: Engine) -> bool:
+        Time.alpha = script.random()
+        if script.random() < .05:
+            Input.set_keys(script.choice([(), (sdl2.SDLK_UP, ), (sdl2.SDLK_DOWN, )]))
+        return False
+
+    engine.run_headless(GameScene(), 600, draw_between_steps)
+    recording = recorder.stop(engine)
+    Input.set_keys(())
+
+    result = replay(recording)
+    assert not result.diverged
+    assert result.steps == 600
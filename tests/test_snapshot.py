@@ -0,0 +1,85 @@
+import pytest
+import sdl2
+
+from core.engine import Engine
+from core.entity import Entity
+from core.input import Input
+from core.snapshot import SnapshotRing
+from pong.scenes.game_scene import GameScene
+
+
+def start_game(seed: int) -> Engine:
+    engine = Engine()
+    engine.reseed(seed)
+    engine.scene = GameScene()
+    engine.step()
+    return engine
+
+
+def step(engine: Engine, steps: int) -> None:
+    """ Step with a player that follows the ball, so the input depends on the state. """
+    ball = Entity.find("Ball")
+    player = Entity.find("Player")
+    for _ in range(steps):
+        keys = list()
+        if ball.y < player.y - 3:
+            keys.append(sdl2.SDLK_UP)
+        if ball.y > player.y + 3:
+            keys.append(sdl2.SDLK_DOWN)
+        Input.set_keys(keys)
+        engine.step()
+    Input.set_keys(())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_load_state_replays_the_same_steps(seed: int) -> None:
+    engine = start_game(seed)
+    step(engine, 200)
+
+    snapshot = engine.scene.save_state()
+    step(engine, 500)
+    expected = engine.scene.save_state()
+
+    engine.scene.load_state(snapshot)
+    assert engine.scene.save_state() == snapshot
+    step(engine, 500)
+    assert engine.scene.save_state() == expected
+
+
+def test_load_state_after_adding_entity_raises() -> None:
+    engine = start_game(0)
+    snapshot = engine.scene.save_state()
+
+    engine.scene.entities.add(Entity())
+    engine.scene.entities.update_list()
+    with pytest.raises(ValueError):
+        engine.scene.load_state(snapshot)
+
+
+def test_rewind_after_ring_wraps() -> None:
+    engine = start_game(1)
+    ring = SnapshotRing(capacity=5)
+    snapshots = list()
+    for _ in range(12):
+        step(engine, 10)
+        ring.push(engine.scene)
+        snapshots.append(engine.scene.save_state())
+
+    # Only the newest snapshots are kept
+    assert len(ring) == 5
+    assert [ring.get(steps_back) for steps_back in range(5)] == snapshots[:-6:-1]
+    with pytest.raises(IndexError):
+        ring.get(5)
+
+    # Rewinding restores an older snapshot, and drops the ones after it
+    ring.rewind(engine.scene, 2)
+    assert engine.scene.save_state() == snapshots[-3]
+    assert len(ring) == 3
+    assert ring.get(0) == snapshots[-3]
+
+    # New snapshots go after the one that was rewound to
+    step(engine, 10)
+    ring.push(engine.scene)
+    assert len(ring) == 4
+    assert ring.get(1) == snapshots[-3]
+    assert ring.get(3) == snapshots[-5]
@@ -0,0 +1,45 @@
+import random
+
+from core.datatypes.rect import Rect
+from core.spatial_hash import SpatialHash
+
+
+class Box:
+    """ Stands in for an actor. The spatial hash only uses the bounding box. """
+    def __init__(self, bbox: Rect) -> None:
+        self.bbox = bbox
+
+
+def random_rect(rng: random.Random) -> Rect:
+    """ Get a rectangle, often with fractional edges. """
+    x = rng.randint(-40, 300) + rng.choice((0, .25, .5))
+    y = rng.randint(-40, 200) + rng.choice((0, .5))
+    return Rect(x, y, rng.randint(1, 40), rng.randint(1, 40))
+
+
+def test_fractional_right_edge_reaches_next_cell() -> None:
+    spatial_hash = SpatialHash(32)
+    assert spatial_hash.cell_range(Rect(28.5, 0, 4, 4)) == (0, 0, 1, 0)
+    assert spatial_hash.cell_range(Rect(28, 0, 4, 4)) == (0, 0, 0, 0)
+
+    box = Box(Rect(32, 0, 4, 4))
+    spatial_hash.insert(box)
+    assert spatial_hash.query(Rect(28.5, 0, 4, 4)) == [box]
+
+
+def test_query_matches_brute_force() -> None:
+    for seed in range(100):
+        rng = random.Random(seed)
+        spatial_hash = SpatialHash(32)
+        boxes = [Box(random_rect(rng)) for _ in range(60)]
+        for box in boxes:
+            spatial_hash.insert(box)
+
+        # Move some boxes after they were inserted
+        for box in rng.sample(boxes, 20):
+            box.bbox = random_rect(rng)
+            spatial_hash.update(box)
+
+        for _ in range(50):
+            rect = random_rect(rng)
+            assert spatial_hash.query(rect) == [box for box in boxes if rect.intersects(box.bbox)]
@@ -0,0 +1,282 @@
+""" Tune the computer paddle by playing headless matches for a grid of parameters.
+Matches are spread over a process pool. Each match's result is written to a CSV file as soon as it finishes, and the
+results are summarized for each set of parameters at the end.
+
+    python tune.py --think-timer-min 0.1 0.2 --defense-error 5 10 15 --matches 50 --output results.csv
+    python tune.py --summarize results.csv
+"""
+import argparse
+import csv
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+
+class Parameters(NamedTuple):
+    """ One point in the parameter grid. """
+    think_timer_min: float
+    think_timer_max: float
+    defense_error: float
+    move_speed: float
+    start_speed: float
+
+
+class MatchTask(NamedTuple):
+    """ A match to play with one set of parameters. """
+    variant: int
+    parameters: Parameters
+    seed: int
+    points: int
+    max_steps: int
+
+
+class MatchResult(NamedTuple):
+    """ The outcome of one match.
+    A rally is the number of paddle hits before a point was scored, or before the match ended.
+    A rally that was still going at the end is only counted if the ball had hit a paddle.
+    """
+    variant: int
+    seed: int
+    player_score: int
+    computer_score: int
+    steps: int
+    hits: int
+    rallies: int
+    longest_rally: int
+    cpu_time: float
+
+
+# Columns of the results file
+FIELDS = ("variant", ) + Parameters._fields + MatchResult._fields[1:]
+
+
+def main() -> int:
+    args = parse_args()
+    if args.summarize:
+        print(summarize(read_results(args.summarize)))
+        return 0
+
+    grid = parameter_grid(args)
+    tasks = [
+        MatchTask(variant, parameters, args.seed + match, args.points, args.max_steps)
+        for variant, parameters in enumerate(grid)
+        for match in range(args.matches)
+    ]
+    print(f"Playing {len(tasks)} matches for {len(grid)} sets of parameters")
+
+    # Small chunks keep the workers busy until the end, without sending every task on its own
+    processes = args.processes or os.cpu_count() or 1
+    chunk_size = max(1, len(tasks) // (processes * 16))
+
+    start = time.perf_counter()
+    results = list()
+    with open(args.output, "w", newline="") as file, multiprocessing.Pool(processes, initialize_worker) as pool:
+        writer = csv.writer(file)
+        writer.writerow(FIELDS)
+        for result in pool.imap_unordered(play_match, tasks, chunk_size):
+            writer.writerow(result_row(result, grid[result.variant]))
+            results.append((grid[result.variant], result))
+
+    print(f"Finished in {time.perf_counter() - start:.1f} s. Results were saved to {args.output}")
+    print(summarize(results))
+    return 0
+
+
+def parse_args() -> argparse.Namespace:
+    """ Parse the command line arguments. """
+    parser = argparse.ArgumentParser(description="Tune the computer paddle with headless matches")
+    parser.add_argument("--think-timer-min", type=float, nargs="+", default=[0.2], metavar="SECONDS")
+    parser.add_argument("--think-timer-max", type=float, nargs="+", default=[0.5], metavar="SECONDS")
+    parser.add_argument(
+        "--defense-error",
+        type=float,
+        nargs="+",
+        default=[10.0],
+        metavar="PIXELS",
+        help="the most that the computer's defense position is off by, before it's scaled"
+    )
+    parser.add_argument("--move-speed", type=float, nargs="+", default=[2.0], metavar="PIXELS", help="paddle speed")
+    parser.add_argument(
+        "--start-speed",
+        type=float,
+        nargs="+",
+        default=[2.0],
+        metavar="PIXELS",
+        help="ball launch speed"
+    )
+    parser.add_argument("--matches", type=int, default=20, help="matches to play for each set of parameters")
+    parser.add_argument("--points", type=int, default=5, help="a match ends when either side has this many points")
+    parser.add_argument(
+        "--max-steps",
+        type=int,
+        default=60 * 60 * 5,
+        help="a match also ends after this many steps"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the first match. Every set of parameters plays the same seeds."
+    )
+    parser.add_argument("--processes", type=int, help="worker processes (one per core by default)")
+    parser.add_argument("--output", type=Path, default=Path("tune_results.csv"), help="file to stream results to")
+    parser.add_argument("--summarize", type=Path, metavar="FILE", help="summarize a results file instead of playing")
+    return parser.parse_args()
+
+
+def parameter_grid(args: argparse.Namespace) -> list[Parameters]:
+    """ Get every combination of the parameter values. """
+    return [
+        Parameters(*values) for values in itertools.product(
+            args.think_timer_min, args.think_timer_max, args.defense_error, args.move_speed, args.start_speed
+        )
+    ]
+
+
+def initialize_worker() -> None:
+    """ Start SDL in each worker process. """
+    # SDL turns SIGTERM into a quit event by default, which would stop the pool from terminating its workers
+    os.environ["SDL_NO_SIGNAL_HANDLERS"] = "1"
+
+    from core.utilities.sdl_init import initialize_sdl
+    initialize_sdl(headless=True)
+
+    from pong.game import mount_content_pack
+    mount_content_pack()
+
+
+def play_match(task: MatchTask) -> MatchResult:
+    """ Play a match between the computer and a scripted player that follows the ball. """
+    from core.engine import Engine
+    from core.entity import Entity
+    from core.input import Input
+    from pong.scenes.game_scene import GameScene
+
+    start = time.process_time()
+
+    # Load the scene, then apply the parameters
+    engine = Engine()
+    engine.reseed(task.seed)
+    engine.scene = GameScene()
+    engine.step()
+
+    ball = Entity.find("Ball")
+    player = Entity.find("Player")
+    computer = Entity.find("Computer")
+    score = Entity.find("Score")
+
+    parameters = task.parameters
+    computer.think_timer_min = parameters.think_timer_min
+    computer.think_timer_max = parameters.think_timer_max
+    computer.defense_error = parameters.defense_error
+    player.move_speed = parameters.move_speed
+    computer.move_speed = parameters.move_speed
+    ball.start_speed = parameters.start_speed
+
+    # Play until either side has enough points
+    points = 0
+    rally_start = 0
+    longest_rally = 0
+    steps = 0
+    while steps < task.max_steps and max(score.player_1_score, score.player_2_score) < task.points:
+        Input.set_keys(follow_ball(ball, player))
+        engine.step()
+        steps += 1
+
+        # A point ends the rally
+        if score.player_1_score + score.player_2_score != points:
+            points = score.player_1_score + score.player_2_score
+            longest_rally = max(longest_rally, ball.hits - rally_start)
+            rally_start = ball.hits
+
+    # The match can end during a rally
+    rallies = points
+    if ball.hits > rally_start:
+        rallies += 1
+        longest_rally = max(longest_rally, ball.hits - rally_start)
+
+    Input.set_keys(())
+    return MatchResult(
+        task.variant,
+        task.seed,
+        score.player_1_score,
+        score.player_2_score,
+        steps,
+        ball.hits,
+        rallies,
+        longest_rally,
+        time.process_time() - start
+    )
+
+
+def follow_ball(ball, player, dead_zone: int = 3) -> set[int]:
+    """ Get the keys for a player that moves towards the ball whenever it is further away than the dead zone. """
+    import sdl2
+
+    keys = set()
+    if ball.y < player.y - dead_zone:
+        keys.add(sdl2.SDLK_UP)
+    if ball.y > player.y + dead_zone:
+        keys.add(sdl2.SDLK_DOWN)
+    return keys
+
+
+def result_row(result: MatchResult, parameters: Parameters) -> tuple:
+    """ Get the columns of a result, in the order of FIELDS. """
+    return (result.variant, ) + parameters + result[1:-1] + (round(result.cpu_time, 4), )
+
+
+def read_results(file_path: Path) -> Iterator[tuple[Parameters, MatchResult]]:
+    """ Read the results that were saved to a file. """
+    with open(file_path, newline="") as file:
+        for row in csv.DictReader(file):
+            parameters = Parameters(*(float(row[field]) for field in Parameters._fields))
+            yield parameters, MatchResult(
+                int(row["variant"]),
+                int(row["seed"]),
+                int(row["player_score"]),
+                int(row["computer_score"]),
+                int(row["steps"]),
+                int(row["hits"]),
+                int(row["rallies"]),
+                int(row["longest_rally"]),
+                float(row["cpu_time"])
+            )
+
+
+def summarize(results: Iterable[tuple[Parameters, MatchResult]]) -> str:
+    """ Get a table with the computer's win rate, the average and longest rally and the CPU time for each set of
+    parameters. Rallies that were still going when a match ended are included.
+    """
+    totals: dict[Parameters, list] = dict()
+    for parameters, result in results:
+        total = totals.setdefault(parameters, [0, 0, 0, 0, 0, 0, 0.0])
+        total[0] += 1
+        total[1] += result.computer_score > result.player_score
+        total[2] += result.rallies
+        total[3] += result.hits
+        total[4] = max(total[4], result.longest_rally)
+        total[5] += result.steps
+        total[6] += result.cpu_time
+
+    header = f"{'think min':>10}{'think max':>10}{'error':>8}{'move':>6}{'start':>6}"
+    header += f"{'matches':>9}{'comp wins':>10}{'rally':>8}{'longest':>9}{'steps':>9}{'cpu s':>8}"
+    lines = [header]
+    for parameters in sorted(totals):
+        matches, wins, rallies, hits, longest, steps, cpu_time = totals[parameters]
+        average_rally = hits / rallies if rallies else 0.0
+        lines.append(
+            f"{parameters.think_timer_min:10.3f}{parameters.think_timer_max:10.3f}{parameters.defense_error:8.1f}"
+            f"{parameters.move_speed:6.1f}{parameters.start_speed:6.1f}"
+            f"{matches:9d}{wins / matches:10.1%}{average_rally:8.2f}{longest:9d}"
+            f"{steps / matches:9.0f}{cpu_time:8.1f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    sys.exit(main())